@@ -47,7 +47,7 @@ class MultiPeriodModifier(NPIBase):
         self.npi = pd.DataFrame(
             default_value,
             index=self.subpops,
-            columns=pd.date_range(self.start_date, self.end_date),
+            columns=helpers._cached_date_range(self.start_date, self.end_date),
         )
 
         self.parameters = pd.DataFrame(
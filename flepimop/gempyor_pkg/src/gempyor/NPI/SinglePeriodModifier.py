@@ -6,6 +6,10 @@ from .base import NPIBase
 
 
 class SinglePeriodModifier(NPIBase):
+    # reductions are multiplicative factors in [0, 1] or small additive offsets: single precision is plenty and
+    # halves the memory traffic of the (n_subpops, n_days) block
+    NPI_DTYPE = np.float32
+
     def __init__(
         self,
         *,
@@ -32,6 +36,7 @@ class SinglePeriodModifier(NPIBase):
         self.pnames_overlap_operation_reductionprod = pnames_overlap_operation_reductionprod
 
         self.subpops = subpops
+        self._subpop_index, self._subpop_set = helpers._cached_subpop_lookups(tuple(self.subpops))
 
         # Get name of the parameter to reduce
         self.param_name = npi_config["parameter"].as_str().lower().replace(" ", "")
@@ -43,15 +48,21 @@ class SinglePeriodModifier(NPIBase):
         ):
             default_value = 0.0
 
-        self.npi = pd.DataFrame(
-            default_value,
-            index=self.subpops,
-            columns=pd.date_range(self.start_date, self.end_date),
+        # the reduction is filled as a plain (n_subpops, n_days) block, then labeled once as self.npi (see below)
+        npi_values = np.full(
+            (len(self.subpops), (self.end_date - self.start_date).days + 1), default_value, dtype=self.NPI_DTYPE
         )
+        # each column gets its final dtype up front, so that filling them doesn't upcast everything to object
+        nsubpops = len(self._subpop_index)
         self.parameters = pd.DataFrame(
-            default_value,
-            index=self.subpops,
-            columns=["modifier_name", "start_date", "end_date", "parameter", "value"],
+            {
+                "modifier_name": np.full(nsubpops, self.name, dtype=object),
+                "start_date": np.full(nsubpops, np.datetime64(self.start_date, "D")),
+                "end_date": np.full(nsubpops, np.datetime64(self.end_date, "D")),
+                "parameter": np.full(nsubpops, self.param_name, dtype=object),
+                "value": np.full(nsubpops, default_value),
+            },
+            index=self._subpop_index,
         )
 
         if (loaded_df is not None) and self.name in loaded_df["modifier_name"].values:
@@ -60,7 +71,10 @@ class SinglePeriodModifier(NPIBase):
             self.__createFromConfig(npi_config)
 
         # if parameters are exceeding global start/end dates, index of parameter df will be out of range so check first
-        if self.parameters["start_date"].min() < self.start_date or self.parameters["end_date"].max() > self.end_date:
+        start_dates = self.parameters["start_date"].to_numpy(dtype="datetime64[D]")
+        end_dates = self.parameters["end_date"].to_numpy(dtype="datetime64[D]")
+        global_start_date, global_end_date = np.datetime64(self.start_date, "D"), np.datetime64(self.end_date, "D")
+        if (start_dates < global_start_date).any() or (end_dates > global_end_date).any():
             raise ValueError(f"""{self.name} : at least one period start or end date is not between global dates""")
 
         # for index in self.parameters.index:
@@ -68,39 +82,51 @@ class SinglePeriodModifier(NPIBase):
         ## This the line that does the work
         #    self.npi_old.loc[index, period_range] = np.tile(self.parameters["value"][index], (len(period_range), 1)).T
 
-        period_range = pd.date_range(self.parameters["start_date"].iloc[0], self.parameters["end_date"].iloc[0])
-        self.npi.loc[self.parameters.index, period_range] = np.tile(
-            self.parameters["value"][:], (len(period_range), 1)
-        ).T
+        # write straight into the ndarray at integer positions: rows from the subpop index, columns as day offsets
+        # from the global start date, and broadcast the (n_affected_subpops, 1) values over the period.
+        row_idx = self._subpop_index.get_indexer(self.parameters.index)
+        col_start = (self.parameters["start_date"].iloc[0] - pd.Timestamp(self.start_date)).days
+        col_end = (self.parameters["end_date"].iloc[0] - pd.Timestamp(self.start_date)).days + 1
+        npi_values[row_idx, col_start:col_end] = self.parameters["value"].to_numpy(dtype=self.NPI_DTYPE)[:, None]
+
+        # labeled once here and then returned as is, so that in-place edits through self.npi are kept
+        self.npi = pd.DataFrame(
+            npi_values,
+            index=self.subpops,
+            columns=helpers._cached_date_range(self.start_date, self.end_date),
+        )
 
         # self.__checkErrors()
 
     def __checkErrors(self):
-        min_start_date = self.parameters["start_date"].min()
-        max_start_date = self.parameters["start_date"].max()
-        min_end_date = self.parameters["end_date"].min()
-        max_end_date = self.parameters["end_date"].max()
-        if not ((self.start_date <= min_start_date) & (max_start_date <= self.end_date)):
-            raise ValueError(
-                f"at least one period_start_date [{min_start_date}, {max_start_date}] is not between global dates [{self.start_date}, {self.end_date}]"
-            )
-        if not ((self.start_date <= min_end_date) & (max_end_date <= self.end_date)):
-            raise ValueError(
-                f"at least one period_end_date ([{min_end_date}, {max_end_date}] is not between global dates [{self.start_date}, {self.end_date}]"
-            )
-
-        if not (self.parameters["start_date"] <= self.parameters["end_date"]).all():
-            raise ValueError(f"at least one period_start_date is greater than the corresponding period end date")
-
-        for n in self.affected_subpops:
-            if n not in self.subpops:
-                raise ValueError(f"Invalid config value {n} not in subpops")
+        # plain datetime64[D] arrays: every check below is a single vectorized comparison
+        start_dates = self.parameters["start_date"].to_numpy(dtype="datetime64[D]")
+        end_dates = self.parameters["end_date"].to_numpy(dtype="datetime64[D]")
+        global_start_date, global_end_date = np.datetime64(self.start_date, "D"), np.datetime64(self.end_date, "D")
+        if start_dates.size:
+            min_start_date, max_start_date = start_dates.min(), start_dates.max()
+            min_end_date, max_end_date = end_dates.min(), end_dates.max()
+            if min_start_date < global_start_date or max_start_date > global_end_date:
+                raise ValueError(
+                    f"at least one period_start_date [{min_start_date}, {max_start_date}] is not between global dates [{self.start_date}, {self.end_date}]"
+                )
+            if min_end_date < global_start_date or max_end_date > global_end_date:
+                raise ValueError(
+                    f"at least one period_end_date ([{min_end_date}, {max_end_date}] is not between global dates [{self.start_date}, {self.end_date}]"
+                )
+
+            if (start_dates > end_dates).any():
+                raise ValueError(f"at least one period_start_date is greater than the corresponding period end date")
+
+        invalid_subpops = set(self.affected_subpops) - self._subpop_set
+        if invalid_subpops:
+            raise ValueError(f"Invalid config value {', '.join(sorted(invalid_subpops))} not in subpops")
 
         ### if self.param_name not in REDUCE_PARAMS:
         ###     raise ValueError(f"Invalid parameter name: {self.param_name}. Must be one of {REDUCE_PARAMS}")
 
         # Validate
-        if (self.npi == 0).all(axis=None):
+        if (self.npi.to_numpy() == 0).all():
             print(f"Warning: The intervention in config: {self.name} does nothing.")
 
         #  if (self.npi > 1).any(axis=None):
@@ -108,56 +134,46 @@ class SinglePeriodModifier(NPIBase):
         #          f"The intervention in config: {self.name} has reduction of {self.param_name} is greater than 1"
         #      )
 
-    def __createFromConfig(self, npi_config):
+    def __select_affected_subpops(self, npi_config):
         # Optional config field "subpop"
         # If values of "subpop" is "all" or unspecified, run on all subpops.
         # Otherwise, run only on subpops specified.
-        self.affected_subpops = set(self.subpops)
         if npi_config["subpop"].exists() and npi_config["subpop"].get() != "all":
             self.affected_subpops = {str(n.get()) for n in npi_config["subpop"]}
+            self.parameters = self.parameters[self.parameters.index.isin(self.affected_subpops)]
+        else:
+            # all subpops are affected: reuse the shared set and skip scanning the index
+            self.affected_subpops = self._subpop_set
 
-        self.parameters = self.parameters[self.parameters.index.isin(self.affected_subpops)]
+    def __createFromConfig(self, npi_config):
+        self.__select_affected_subpops(npi_config)
         # Create reduction
         self.dist = npi_config["value"].as_random_distribution()
 
-        self.parameters["modifier_name"] = self.name
-        self.parameters["start_date"] = (
-            npi_config["period_start_date"].as_date() if npi_config["period_start_date"].exists() else self.start_date
-        )
-        self.parameters["end_date"] = (
-            npi_config["period_end_date"].as_date() if npi_config["period_end_date"].exists() else self.end_date
-        )
-        self.parameters["parameter"] = self.param_name
+        if npi_config["period_start_date"].exists():
+            self.parameters["start_date"] = np.datetime64(npi_config["period_start_date"].as_date(), "D")
+        if npi_config["period_end_date"].exists():
+            self.parameters["end_date"] = np.datetime64(npi_config["period_end_date"].as_date(), "D")
         self.spatial_groups = helpers.get_spatial_groups(npi_config, list(self.affected_subpops))
         if self.spatial_groups["ungrouped"]:
             self.parameters.loc[self.spatial_groups["ungrouped"], "value"] = self.dist(
                 size=len(self.spatial_groups["ungrouped"])
             )
         if self.spatial_groups["grouped"]:
-            for group in self.spatial_groups["grouped"]:
-                drawn_value = self.dist(size=1) * np.ones(len(group))
-                self.parameters.loc[group, "value"] = drawn_value
+            self.__set_grouped_values(self.dist(size=len(self.spatial_groups["grouped"])))
 
     def __createFromDf(self, loaded_df, npi_config):
         loaded_df.index = loaded_df.subpop
         loaded_df = loaded_df[loaded_df["modifier_name"] == self.name]
 
-        self.affected_subpops = set(self.subpops)
-        if npi_config["subpop"].exists() and npi_config["subpop"].get() != "all":
-            self.affected_subpops = {str(n.get()) for n in npi_config["subpop"]}
-
-        self.parameters = self.parameters[self.parameters.index.isin(self.affected_subpops)]
-        self.parameters["modifier_name"] = self.name
-        self.parameters["parameter"] = self.param_name
+        self.__select_affected_subpops(npi_config)
 
         # self.parameters = loaded_df[["modifier_name", "start_date", "end_date", "parameter", "value"]].copy()
         # dates are picked from config
-        self.parameters["start_date"] = (
-            npi_config["period_start_date"].as_date() if npi_config["period_start_date"].exists() else self.start_date
-        )
-        self.parameters["end_date"] = (
-            npi_config["period_end_date"].as_date() if npi_config["period_end_date"].exists() else self.end_date
-        )
+        if npi_config["period_start_date"].exists():
+            self.parameters["start_date"] = np.datetime64(npi_config["period_start_date"].as_date(), "D")
+        if npi_config["period_end_date"].exists():
+            self.parameters["end_date"] = np.datetime64(npi_config["period_end_date"].as_date(), "D")
         ## This is more legible to me, but if we change it here, we should change it in __createFromConfig as well
         # if npi_config["period_start_date"].exists():
         #    self.parameters["start_date"] = [datetime.date.fromisoformat(date) for date in self.parameters["start_date"]]
@@ -181,8 +197,22 @@ class SinglePeriodModifier(NPIBase):
                 self.spatial_groups["ungrouped"], "value"
             ]
         if self.spatial_groups["grouped"]:
-            for group in self.spatial_groups["grouped"]:
-                self.parameters.loc[group, "value"] = loaded_df.loc[",".join(group), "value"]
+            # groups are written to disk as one row whose subpop is the comma-joined list of its members
+            group_names = [",".join(group) for group in self.spatial_groups["grouped"]]
+            group_pos = loaded_df.index.get_indexer(group_names)
+            if (group_pos == -1).any():
+                raise KeyError(
+                    f"{self.name} : spatial groups {[g for g, p in zip(group_names, group_pos) if p == -1]} not found in loaded modifiers"
+                )
+            self.__set_grouped_values(loaded_df["value"].to_numpy()[group_pos])
+
+    def __set_grouped_values(self, group_values):
+        "Give each subpop of a spatial group the value of its group, in one write for all groups"
+        groups = self.spatial_groups["grouped"]
+        pos = self.parameters.index.get_indexer(helpers.flatten_list_of_lists(groups))
+        self.parameters.iloc[pos, self.parameters.columns.get_loc("value")] = np.repeat(
+            group_values, [len(group) for group in groups]
+        )
 
     def get_default(self, param):
         if param in self.pnames_overlap_operation_sum or param in self.pnames_overlap_operation_reductionprod:
@@ -197,28 +227,22 @@ class SinglePeriodModifier(NPIBase):
         return self.get_default(param)
 
     def getReductionToWrite(self):
-        # spatially ungrouped dataframe
-        df = self.parameters[self.parameters.index.isin(self.spatial_groups["ungrouped"])].copy()
-        df.index.name = "subpop"
-        df["start_date"] = df["start_date"].astype("str")
-        df["end_date"] = df["end_date"].astype("str")
+        # spatially ungrouped dataframe. assign() builds the output frame with the dates as strings in one go,
+        # without copying the selection first
+        df = self.parameters[self.parameters.index.isin(self.spatial_groups["ungrouped"])]
+        df = df.assign(start_date=df["start_date"].astype("str"), end_date=df["end_date"].astype("str"))
+        df_list = [df.rename_axis("subpop")]
 
         # spatially grouped dataframe
-        for group in self.spatial_groups["grouped"]:
-            # we use the first subpop to represent the group
-            df_group = self.parameters[self.parameters.index == group[0]].copy()
-
-            row_group = pd.DataFrame.from_dict(
-                {
-                    "subpop": ",".join(group),
-                    "modifier_name": df_group["modifier_name"],
-                    "parameter": df_group["parameter"],
-                    "start_date": df_group["start_date"].astype("str"),
-                    "end_date": df_group["end_date"].astype("str"),
-                    "value": df_group["value"],
-                }
-            ).set_index("subpop")
-            df = pd.concat([df, row_group])
+        if self.spatial_groups["grouped"]:
+            # we use the first subpop to represent the group, and select all the groups at once
+            df_group = self.parameters.loc[[group[0] for group in self.spatial_groups["grouped"]]]
+            df_group = df_group.assign(
+                start_date=df_group["start_date"].astype("str"), end_date=df_group["end_date"].astype("str")
+            )
+            df_group.index = pd.Index([",".join(group) for group in self.spatial_groups["grouped"]], name="subpop")
+            df_list.append(df_group)
 
+        df = pd.concat(df_list)
         df = df.reset_index()
         return df
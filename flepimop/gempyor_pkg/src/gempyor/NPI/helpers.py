@@ -1,6 +1,29 @@
+import functools
 import pandas as pd
 import numpy as np
 import typing
+from numba import jit
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_date_range(start, end) -> pd.DatetimeIndex:
+    """
+    Daily DatetimeIndex from start to end (inclusive), shared between all modifiers of a simulation.
+    DatetimeIndex is immutable, so handing out the same object to every modifier is safe.
+    """
+    return pd.date_range(start, end)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_subpop_lookups(subpops: tuple) -> typing.Tuple[pd.Index, frozenset]:
+    """
+    Index (for positional lookups) and set (for membership tests) of the subpops, built once and shared between
+    all modifiers of a simulation instead of being rebuilt by each of them.
+    """
+    return pd.Index(subpops), frozenset(subpops)
+
+
+_REDUCTION_METHODS = {"product": 0, "reduction_product": 1, "sum": 2}
 
 
 # Helper function
@@ -10,17 +33,43 @@ def reduce_parameter(
     method: str = "product",
 ) -> np.ndarray:
     if isinstance(modification, pd.DataFrame):
-        modification = modification.T
-        modification.index = pd.to_datetime(modification.index.astype(str))
-        modification = modification.resample("1D").ffill().to_numpy()  # Type consistency:
+        if isinstance(modification.columns, pd.DatetimeIndex) and modification.columns.freqstr == "D":
+            # modifiers already produce one column per day: resampling would be a (costly) no-op
+            modification = modification.to_numpy().T
+        else:
+            modification = modification.T
+            modification.index = pd.to_datetime(modification.index.astype(str))
+            modification = modification.resample("1D").ffill().to_numpy()  # Type consistency:
+    if method not in _REDUCTION_METHODS:
+        raise ValueError(f"Unknown method to do NPI reduction, got {method}")
+    if isinstance(modification, np.ndarray) and modification.ndim == 2 and modification.shape == parameter.shape:
+        # full (n_days, nsubpops) reduction: elementwise kernel, without temporaries
+        return _apply_modification(parameter, modification, _REDUCTION_METHODS[method])
     if method == "reduction_product":
         return parameter * (1 - modification)
     elif method == "sum":
         return parameter + modification
     elif method == "product":
         return parameter * modification
-    else:
-        raise ValueError(f"Unknown method to do NPI reduction, got {method}")
+
+
+@jit(nopython=True, cache=True)
+def _apply_modification(parameter, modification, method_code):
+    """
+    Elementwise reduction of a (n_days, nsubpops) parameter by a modification of the same shape.
+    method_code is one of the values of _REDUCTION_METHODS. Single threaded, as it runs inside the calibration
+    pool workers, and without fastmath so that NaN propagate as in the numpy expressions.
+    """
+    out = np.empty(parameter.shape)
+    for t in range(parameter.shape[0]):
+        for s in range(parameter.shape[1]):
+            if method_code == 1:
+                out[t, s] = parameter[t, s] * (1 - modification[t, s])
+            elif method_code == 2:
+                out[t, s] = parameter[t, s] + modification[t, s]
+            else:
+                out[t, s] = parameter[t, s] * modification[t, s]
+    return out
 
 
 def get_spatial_groups(grp_config, affected_subpops: list) -> dict:
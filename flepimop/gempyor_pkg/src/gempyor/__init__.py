@@ -1,4 +1,41 @@
 ## All functions are in minimal inference.
 
-from .inference import *
+import importlib
+import importlib.util
+
+from . import utils
 from .utils import *
+
+# the API of inference (its functions and classes, and the gempyor submodules it re-exported), loaded on first use by
+# __getattr__ below. tests/utils/test_utils.py checks that it covers inference.
+_LAZY_NAMES = [
+    "GempyorInference",
+    "autodetect_scenarios",
+    "get_static_arguments",
+    "paramred_parallel",
+    "paramred_parallel_config",
+    "simulation_atomic",
+    "file_paths",
+    "inference_parameter",
+    "logloss",
+    "model_info",
+    "outcomes",
+    "seir",
+    "statistics",
+]
+# star imports get the utils names and, through __getattr__, the lazy ones
+__all__ = [name for name in dir(utils) if not name.startswith("_")] + _LAZY_NAMES
+
+
+def __getattr__(name):
+    # The names of inference (and with it numba and the whole simulation stack) are loaded on first use, so that
+    # e.g. gempyor.file_paths or gempyor.model_info can be imported without paying for them. Other names only
+    # import the submodule they name, if any, so that e.g. a hasattr() probe does not load inference.
+    if name in _LAZY_NAMES:
+        inference = importlib.import_module(".inference", __name__)
+        if hasattr(inference, name):
+            return getattr(inference, name)
+    if not name.startswith("__") and importlib.util.find_spec(f"{__name__}.{name}") is not None:
+        # submodules that inference used to import as a side effect, e.g. gempyor.seeding
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
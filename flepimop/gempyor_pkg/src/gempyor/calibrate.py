@@ -6,14 +6,37 @@ from gempyor.utils import config, as_list
 import gempyor
 import numpy as np
 import os, shutil, copy
+import functools
 import emcee
 import multiprocessing
+import numba
 import gempyor.postprocess_inference
 
 # from .profile import profile_options
 
-# disable  operations using the MKL linear algebra.
-os.environ["OMP_NUM_THREADS"] = "1"
+# Worker-local GempyorInference, set once per worker by the pool initializer. Tasks then only ship the proposal,
+# instead of pickling the whole inference object along with a bound method for every evaluation.
+_worker_inference = None
+
+
+def _init_worker(gempyor_inference, num_threads):
+    global _worker_inference
+    # share the cores between workers, instead of each worker using all of them. numpy, numba and the BLAS/OpenMP
+    # libraries are already loaded here, so their thread pools are resized directly: OMP_NUM_THREADS would be ignored.
+    # numba refuses more threads than NUMBA_NUM_THREADS (and a pool initializer that raises respawns forever)
+    numba.set_num_threads(min(num_threads, numba.config.NUMBA_NUM_THREADS))
+    try:
+        import threadpoolctl
+    except ImportError:  # optional, only the BLAS/OpenMP pools are then left as they are
+        pass
+    else:
+        threadpoolctl.threadpool_limits(limits=num_threads)
+    _worker_inference = gempyor_inference
+
+
+def _worker_logloss(proposal, save=False):
+    _worker_inference.set_save(save)
+    return _worker_inference.get_logloss_as_single_number(proposal)
 
 
 @click.command()
@@ -144,6 +167,8 @@ def calibrate(
         nwalkers = config["nslots"].as_number()  # TODO
     print(f"Number of walkers be run: {nwalkers}")
 
+    # the test run is alone on the machine and may use all the cores, the pool workers then each get their share
+    num_threads = max(1, multiprocessing.cpu_count() // ncpu)
     test_run = True
     if test_run:
         gempyor_inference.perform_test_run()
@@ -172,42 +197,56 @@ def calibrate(
         backend = emcee.backends.HDFBackend(filename)
         backend.reset(nwalkers, gempyor_inference.inferpar.get_dim())
         p0 = gempyor_inference.inferpar.draw_initial(n_draw=nwalkers)
-        for i in range(nwalkers):
-            assert gempyor_inference.inferpar.check_in_bound(
-                proposal=p0[i]
-            ), "The initial parameter draw is not within the bounds, check the perturbation distributions"
+        in_bounds = gempyor_inference.inferpar.check_in_bound_batch(proposals=p0)
+        assert in_bounds.all(), (
+            f"The initial parameter draw is not within the bounds for walkers {np.where(~in_bounds)[0].tolist()}, "
+            "check the perturbation distributions"
+        )
 
     moves = [(emcee.moves.StretchMove(live_dangerously=True), 1)]
     gempyor_inference.set_silent(False)
-    with multiprocessing.Pool(ncpu) as pool:
+    # a single pool serves both the MCMC and the final sampling, so workers are only started once
+    with multiprocessing.Pool(ncpu, initializer=_init_worker, initargs=(gempyor_inference, num_threads)) as pool:
         sampler = emcee.EnsembleSampler(
             nwalkers,
             gempyor_inference.inferpar.get_dim(),
-            gempyor_inference.get_logloss_as_single_number,
+            _worker_logloss,
             pool=pool,
             backend=backend,
             moves=moves,
         )
         state = sampler.run_mcmc(p0, niter, progress=True, skip_initial_state_check=True)
 
-    print(f"Done, mean acceptance fraction: {np.mean(sampler.acceptance_fraction):.3f}")
+        print(f"Done, mean acceptance fraction: {np.mean(sampler.acceptance_fraction):.3f}")
 
-    # plotting the chain
-    sampler = emcee.backends.HDFBackend(filename, read_only=True)
-    gempyor.postprocess_inference.plot_chains(
-        inferpar=gempyor_inference.inferpar, sampler_output=sampler, sampled_slots=None, save_to=f"{run_id}_chains.pdf"
-    )
-    print("EMCEE Run done, doing sampling")
+        # plotting the chain
+        sampler = emcee.backends.HDFBackend(filename, read_only=True)
+        gempyor.postprocess_inference.plot_chains(
+            inferpar=gempyor_inference.inferpar,
+            sampler_output=sampler,
+            sampled_slots=None,
+            save_to=f"{run_id}_chains.pdf",
+        )
+        print("EMCEE Run done, doing sampling")
 
-    shutil.rmtree("model_output/", ignore_errors=True)
-    shutil.rmtree(project_path + "model_output/", ignore_errors=True)
+        shutil.rmtree("model_output/", ignore_errors=True)
+        shutil.rmtree(project_path + "model_output/", ignore_errors=True)
 
-    max_indices = np.argsort(sampler.get_log_prob()[-1, :])[-nsamples:]
-    samples = sampler.get_chain()[-1, max_indices, :]  # the last iteration, for selected slots
-    gempyor_inference.set_save(True)
-    with multiprocessing.Pool(ncpu) as pool:
-        results = pool.starmap(
-            gempyor_inference.get_logloss_as_single_number, [(samples[i, :],) for i in range(len(max_indices))]
+        # only read the last iteration slab from the HDF5 backend, not the whole (niter, nwalkers, ndim) chain
+        last_iteration = sampler.iteration - 1
+        last_log_prob = sampler.get_log_prob(discard=last_iteration)[0, :]
+        # top-nsamples walkers of the last iteration: partition in O(nwalkers), then only sort the selected ones
+        top_indices = np.argpartition(last_log_prob, -min(nsamples, len(last_log_prob)))[-nsamples:]
+        max_indices = top_indices[np.argsort(last_log_prob[top_indices])]
+        samples = sampler.get_chain(discard=last_iteration)[0, max_indices, :]  # the last iteration, for selected slots
+        # results are not needed in order, and batching a few samples per task cuts the IPC round-trips
+        chunksize = max(1, len(max_indices) // (ncpu * 4))
+        results = list(
+            pool.imap_unordered(
+                functools.partial(_worker_logloss, save=True),
+                (samples[i, :] for i in range(len(max_indices))),
+                chunksize=chunksize,
+            )
         )
     # results = []
     # for fn in gempyor.utils.list_filenames(folder="model_output/", filters=[run_id, "hosp.parquet"]):
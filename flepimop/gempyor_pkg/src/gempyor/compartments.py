@@ -5,12 +5,42 @@ import pyarrow.parquet as pq
 import click
 from .utils import config, Timer, as_list
 from . import file_paths
+import functools
 from functools import reduce
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=32)
+def _substitution_function(parameter_names: tuple, string_list: tuple):
+    """
+    Parse the formulas of `string_list` with sympy and lambdify them into a function of the parameters (in the order
+    of `parameter_names`) that returns the list of evaluated formulas.
+    """
+    # is using eval a better way ???
+    import sympy as sp
+
+    # Define the symbols used in the formulas
+    symbolic_parameters_namespace = {name: sp.symbols(name) for name in parameter_names}
+
+    symbolic_parameters = [sp.symbols(name) for name in parameter_names]
+
+    parsed_formulas = []
+    for formula in string_list:
+        try:
+            # here it is very important to pass locals so that e.g if the  gamma parameter
+            # is defined, it is not converted into the gamma scipy function
+            f = sp.sympify(formula, locals=symbolic_parameters_namespace)
+            parsed_formulas.append(f)
+        except Exception as e:
+            print(f"Cannot parse formula: '{formula}' from parameters {parameter_names}")
+            raise (e)  # Print the error message for debugging
+
+    # Create a lambdify function for substitution
+    return sp.lambdify(symbolic_parameters, parsed_formulas)
+
+
 class Compartments:
     # Minimal object to be easily picklable for // runs
     def __init__(self, seir_config=None, compartments_config=None, compartments_file=None, transitions_file=None):
@@ -308,6 +338,15 @@ class Compartments:
         self.transitions = self.parse_transitions(seir_config, False)
 
     def get_transition_array(self):
+        # only depends on the compartments and transitions, that are set at construction: built once per object
+        # instead of once per simulation. Each caller gets its own copies (the arrays are small), so that a caller
+        # modifying them does not change the ones of the next simulations
+        if getattr(self, "_transition_arrays", None) is None:
+            self._transition_arrays = self._build_transition_array()
+        unique_strings, transition_array, proportion_array, proportion_info = self._transition_arrays
+        return list(unique_strings), transition_array.copy(), proportion_array.copy(), proportion_info.copy()
+
+    def _build_transition_array(self):
         with Timer("SEIR.compartments"):
             transition_array = np.zeros((self.transitions.shape[1], self.transitions.shape[0]), dtype="int64")
             for cit, colname in enumerate(("source", "destination")):
@@ -458,38 +497,15 @@ class Compartments:
         return parsed_parameters
 
     def parse_parameter_strings_to_numpy_arrays_v2(self, parameters, parameter_names, string_list):
-        # is using eval a better way ???
-        import sympy as sp
-
         # Validate input lengths
         if len(parameters) != len(parameter_names):
             raise ValueError("Number of parameter values does not match the number of parameter names.")
 
-        # Define the symbols used in the formulas
-        symbolic_parameters_namespace = {name: sp.symbols(name) for name in parameter_names}
-
-        symbolic_parameters = [sp.symbols(name) for name in parameter_names]
-
-        parsed_formulas = []
-        for formula in string_list:
-            try:
-                # here it is very important to pass locals so that e.g if the  gamma parameter
-                # is defined, it is not converted into the gamma scipy function
-                f = sp.sympify(formula, locals=symbolic_parameters_namespace)
-                parsed_formulas.append(f)
-            except Exception as e:
-                print(f"Cannot parse formula: '{formula}' from parameters {parameter_names}")
-                raise (e)  # Print the error message for debugging
-
-        # the list order needs to be right.
-        parameter_values = {param: value for param, value in zip(symbolic_parameters, parameters)}
-        parameter_values_list = [parameter_values[param] for param in symbolic_parameters]
-
-        # Create a lambdify function for substitution
-        substitution_function = sp.lambdify(symbolic_parameters, parsed_formulas)
+        # the sympy parsing only depends on the names, so it is done once per model instead of once per simulation
+        substitution_function = _substitution_function(tuple(parameter_names), tuple(string_list))
 
         # Apply the lambdify function with parameter values as a list
-        substituted_formulas = substitution_function(*parameter_values_list)
+        substituted_formulas = substitution_function(*parameters)
         for i in range(len(substituted_formulas)):
             # sometime it's "1" or "1*1*1*..." which produce an int or float instead of an array
             # in this case we find the next array and set it to that size,
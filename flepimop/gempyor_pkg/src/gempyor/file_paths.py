@@ -36,16 +36,31 @@ def create_file_name_without_extension(
             create_dir_name(run_id, prefix, ftype, inference_filepath_suffix, inference_filename_prefix), exist_ok=True
         )
     filename = pathlib.Path(
-        "model_output",
-        prefix,
-        ftype,
-        inference_filepath_suffix,
-        f"{inference_filename_prefix}{index:>09}.{run_id}.{ftype}",
+        create_file_name_template(run_id, prefix, inference_filepath_suffix, inference_filename_prefix).format(
+            ftype=ftype, index=index
+        )
     )
     # old:  "model_output/%s/%s%09d.%s.%s" % (ftype, prefix, index, run_id, ftype)
     return filename
 
 
+def create_file_name_template(run_id, prefix, inference_filepath_suffix, inference_filename_prefix) -> str:
+    """
+    str.format template (fields: ftype and index) of the filenames without extension of a run_id and prefix, so
+    that callers looking up many files of the same run can build it once.
+    """
+    esc = lambda x: str(x).replace("{", "{{").replace("}", "}}")
+    return str(
+        pathlib.Path(
+            "model_output",
+            esc(prefix),
+            "{ftype}",
+            esc(inference_filepath_suffix),
+            f"{esc(inference_filename_prefix)}{{index:>09}}.{esc(run_id)}.{{ftype}}",
+        )
+    )
+
+
 def run_id():
     return datetime.datetime.strftime(datetime.datetime.now(), "%Y%m%d_%H%M%S%Z")
 
@@ -96,11 +96,12 @@ def simulation_atomic(
     # Parse them
     parsed_parameters = modinf.compartments.parse_parameters(parameters, modinf.parameters.pnames, unique_strings)
 
-    # Convert the seeding data dictionnary to a numba dictionnary
+    # Convert the seeding data dictionnary to a numba dictionnary (asarray does not copy the arrays that already are
+    # int64)
     seeding_data_nbdict = nb.typed.Dict.empty(key_type=nb.types.unicode_type, value_type=nb.types.int64[:])
 
     for k, v in seeding_data.items():
-        seeding_data_nbdict[k] = np.array(v, dtype=np.int64)
+        seeding_data_nbdict[k] = np.asarray(v, dtype=np.int64)
 
     # Compute the SEIR simulation
     states = seir.steps_SEIR(
@@ -160,6 +160,19 @@ class InferenceParameters:
             return False
         return True
 
+    def check_in_bound_batch(self, proposals) -> np.ndarray:
+        """
+        Checks which of several proposals are within parameter bounds, in a single vectorized pass.
+
+        Args:
+            proposals: The proposed parameter values, one proposal per row (e.g. one row per walker).
+
+        Returns:
+            np.ndarray: Boolean vector, True for the proposals that are within bounds.
+        """
+        proposals = np.atleast_2d(proposals)
+        return ((proposals >= np.asarray(self.lbs)) & (proposals <= np.asarray(self.ubs))).all(axis=1)
+
     def hit_lbs(self, proposal) -> np.ndarray:
         return np.array((proposal < self.lbs))
 
@@ -1,10 +1,63 @@
 import pandas as pd
+import numpy as np
 import datetime, os, logging, pathlib, confuse
-from . import seeding, subpopulation_structure, parameters, compartments, file_paths, initial_conditions
+import copy
+import functools
+from . import subpopulation_structure, file_paths
+
+# seeding, parameters, compartments and initial_conditions (and numba, through them), as well as pyarrow and
+# concurrent.futures, are imported where they are used, so that importing model_info for e.g. the filename helpers
+# stays cheap.
 from .utils import read_df, write_df
 
 logger = logging.getLogger(__name__)
 
+# Components built from the config that depend neither on the scenarios nor on the run (e.g. the subpopulation
+# structure, which reads the geodata and mobility files), keyed by the content of the config sections they are built
+# from and by the files these sections name, so that ModelInfo objects for the same config (one per scenario, or one
+# per inference) do not read and parse the same files again.
+_model_spec_cache = {}
+_MODEL_SPEC_CACHE_SIZE = 8
+
+
+def _cached_model_spec(key: tuple, build):
+    """
+    Return a copy of the component cached under `key`, calling `build()` to create it if needed. Components that read
+    files must have _referenced_files() in their key. Each caller gets its own copy, that it may modify without
+    affecting the other ModelInfo objects; the config views the component holds still refer to the config.
+    """
+    if key not in _model_spec_cache:
+        if len(_model_spec_cache) >= _MODEL_SPEC_CACHE_SIZE:
+            del _model_spec_cache[next(iter(_model_spec_cache))]  # oldest entry
+        _model_spec_cache[key] = build()
+    component = _model_spec_cache[key]
+    memo = {id(v): v for v in vars(component).values() if isinstance(v, confuse.ConfigView)}
+    return copy.deepcopy(component, memo)
+
+
+def _referenced_files(section_value, path_prefix: pathlib.Path) -> tuple:
+    """
+    (absolute path, modification time) of each existing file named in a config section, resolved as the components
+    resolve them (under path_prefix, from the current working directory), so that a cache key changes with the
+    working directory and with the content of the files.
+    """
+    found = []
+
+    def walk(value):
+        if isinstance(value, dict):
+            for v in value.values():
+                walk(v)
+        elif isinstance(value, (list, tuple)):
+            for v in value:
+                walk(v)
+        elif isinstance(value, str):
+            path = os.path.abspath(os.path.join(path_prefix, value))
+            if os.path.isfile(path):
+                found.append((path, os.stat(path).st_mtime_ns))
+
+    walk(section_value)
+    return tuple(found)
+
 
 class TimeSetup:
     def __init__(self, config: confuse.ConfigView):
@@ -13,7 +66,11 @@ class TimeSetup:
         if self.tf <= self.ti:
             raise ValueError("tf (time to finish) is less than or equal to ti (time to start)")
         self.n_days = (self.tf - self.ti).days + 1
-        self.dates = pd.date_range(start=self.ti, end=self.tf, freq="D")
+
+    @functools.cached_property
+    def dates(self) -> pd.DatetimeIndex:
+        """The simulated days, only built when they are actually needed (most code only uses ti, tf and n_days)."""
+        return pd.date_range(start=self.ti, end=self.tf, freq="D")
 
 
 class ModelInfo:
@@ -63,8 +120,11 @@ class ModelInfo:
         self.seir_modifiers_scenario = seir_modifiers_scenario
         self.outcome_modifiers_scenario = outcome_modifiers_scenario
 
+        # top-level sections, resolved once through the confuse source stack instead of once per lookup
+        config_sections = set(config.keys())
+
         # Auto-detect old config
-        if config["interventions"].exists():
+        if "interventions" in config_sections:
             raise ValueError(
                 """This config has an intervention section, and has been written for a previous version of flepiMoP/COVIDScenarioPipeline \
                              Please use flepiMoP Version 1.1 (Commit SHA: 0c30c23937dd496d33c2b9fa7c6edb198ad80dac) to run this config. \
@@ -88,18 +148,26 @@ class ModelInfo:
         self.ti = self.time_setup.ti
         self.tf = self.time_setup.tf
         self.n_days = self.time_setup.n_days
-        self.dates = self.time_setup.dates
 
         # 3. What about subpopulations
         subpop_config = config["subpop_setup"]
         if "data_path" in config:
             raise ValueError("The config has a data_path section. This is no longer supported.")
         self.path_prefix = pathlib.Path(path_prefix)
-
-        self.subpop_struct = subpopulation_structure.SubpopulationStructure(
-            setup_name=config["setup_name"].get(),
-            subpop_config=subpop_config,
-            path_prefix=self.path_prefix,
+        self._path_prefix_str = str(self.path_prefix)
+
+        self.subpop_struct = _cached_model_spec(
+            (
+                "subpop_struct",
+                repr(config["setup_name"].get()),
+                repr(subpop_config.get()),
+                _referenced_files(subpop_config.get(), self.path_prefix),
+            ),
+            lambda: subpopulation_structure.SubpopulationStructure(
+                setup_name=config["setup_name"].get(),
+                subpop_config=subpop_config,
+                path_prefix=self.path_prefix,
+            ),
         )
         self.nsubpops = self.subpop_struct.nsubpops
         self.subpop_pop = self.subpop_struct.subpop_pop
@@ -107,87 +175,75 @@ class ModelInfo:
 
         # 4. the SEIR structure
         self.seir_config = None
-        if config["seir"].exists():
+        if "seir" in config_sections:
             self.seir_config = config["seir"]
-            self.parameters_config = config["seir"]["parameters"]
+            self.parameters_config = self.seir_config["parameters"]
             self.initial_conditions_config = (
-                config["initial_conditions"] if config["initial_conditions"].exists() else None
+                config["initial_conditions"] if "initial_conditions" in config_sections else None
             )
-            self.seeding_config = config["seeding"] if config["seeding"].exists() else None
+            self.seeding_config = config["seeding"] if "seeding" in config_sections else None
 
             if self.seeding_config is None and self.initial_conditions_config is None:
-                logging.critical(
+                logger.critical(
                     "The config has a seir: section but no initial_conditions: nor seeding: sections. At least one of them is needed"
                 )
                 # raise ValueError("The config has a seir: section but no initial_conditions: nor seeding: sections. At least one of them is needed")
 
-            # Think if we really want to hold this up.
-            self.parameters = parameters.Parameters(
-                parameter_config=self.parameters_config,
-                ti=self.ti,
-                tf=self.tf,
-                subpop_names=self.subpop_struct.subpop_names,
-                path_prefix=self.path_prefix,
-            )
-            self.seeding = seeding.SeedingFactory(config=self.seeding_config, path_prefix=self.path_prefix)
-            self.initial_conditions = initial_conditions.InitialConditionsFactory(
-                config=self.initial_conditions_config, path_prefix=self.path_prefix
-            )
-            # really ugly references to the config globally here.
-            if config["compartments"].exists() and self.seir_config is not None:
-                self.compartments = compartments.Compartments(
-                    seir_config=self.seir_config, compartments_config=config["compartments"]
-                )
+            # parameters, seeding, initial_conditions and compartments are built on first access (see the properties
+            # below), so that callers only needing e.g. filenames don't pay for them.
+            self.compartments_config = config["compartments"] if "compartments" in config_sections else None
 
             # SEIR modifiers
             self.npi_config_seir = None
-            if config["seir_modifiers"].exists():
-                if config["seir_modifiers"]["scenarios"].exists():
-                    self.npi_config_seir = config["seir_modifiers"]["modifiers"][seir_modifiers_scenario]
-                    self.seir_modifiers_library = config["seir_modifiers"]["modifiers"].get()
+            if "seir_modifiers" in config_sections:
+                seir_modifiers_config = config["seir_modifiers"]
+                seir_modifiers = seir_modifiers_config["modifiers"]
+                self.seir_modifiers_library = seir_modifiers.get()
+                if seir_modifiers_config["scenarios"].exists():
+                    self.npi_config_seir = seir_modifiers[seir_modifiers_scenario]
                 else:
-                    self.seir_modifiers_library = config["seir_modifiers"]["modifiers"].get()
                     raise ValueError("Not implemented yet")  # TODO create a Stacked from all
             elif self.seir_modifiers_scenario is not None:
                 raise ValueError(
                     "An seir modifiers scenario was provided to ModelInfo but no 'seir_modifiers' sections in config"
                 )
             else:
-                logging.info("Running ModelInfo with seir but without SEIR Modifiers")
+                logger.info("Running ModelInfo with seir but without SEIR Modifiers")
 
         elif self.seir_modifiers_scenario is not None:
             raise ValueError("A seir modifiers scenario was provided to ModelInfo but no 'seir:' sections in config")
         else:
-            logging.critical("Running ModelInfo without SEIR")
+            logger.critical("Running ModelInfo without SEIR")
 
         # 5. Outcomes
-        self.outcomes_config = config["outcomes"] if config["outcomes"].exists() else None
+        self.outcomes_config = config["outcomes"] if "outcomes" in config_sections else None
         if self.outcomes_config is not None:
             self.npi_config_outcomes = None
-            if config["outcome_modifiers"].exists():
-                if config["outcome_modifiers"]["scenarios"].exists():
-                    self.npi_config_outcomes = config["outcome_modifiers"]["modifiers"][self.outcome_modifiers_scenario]
-                    self.outcome_modifiers_library = config["outcome_modifiers"]["modifiers"].get()
+            if "outcome_modifiers" in config_sections:
+                outcome_modifiers_config = config["outcome_modifiers"]
+                outcome_modifiers = outcome_modifiers_config["modifiers"]
+                self.outcome_modifiers_library = outcome_modifiers.get()
+                if outcome_modifiers_config["scenarios"].exists():
+                    self.npi_config_outcomes = outcome_modifiers[self.outcome_modifiers_scenario]
                 else:
-                    self.outcome_modifiers_library = config["outcome_modifiers"]["modifiers"].get()
                     raise ValueError("Not implemented yet")  # TODO create a Stacked from all
 
             ## NEED TO IMPLEMENT THIS -- CURRENTLY CANNOT USE outcome modifiers
             elif self.outcome_modifiers_scenario is not None:
-                if config["outcome_modifiers"].exists():
+                if "outcome_modifiers" in config_sections:
                     raise ValueError(
                         "An outcome modifiers scenario was provided to ModelInfo but no 'outcome_modifiers' sections in config"
                     )
                 else:
                     self.outcome_modifiers_scenario = None
             else:
-                logging.info("Running ModelInfo with outcomes but without Outcomes Modifiers")
+                logger.info("Running ModelInfo with outcomes but without Outcomes Modifiers")
         elif self.outcome_modifiers_scenario is not None:
             raise ValueError(
                 "An outcome modifiers scenario was provided to ModelInfo but no 'outcomes:' sections in config"
             )
         else:
-            logging.info("Running ModelInfo without Outcomes")
+            logger.info("Running ModelInfo without Outcomes")
 
         # 6. Inputs and outputs
         if in_run_id is None:
@@ -209,12 +265,15 @@ class ModelInfo:
         self.inference_filename_prefix = inference_filename_prefix
         self.inference_filepath_suffix = inference_filepath_suffix
 
+        # directories already created by this process, so write_simID does not issue a makedirs for every sim
+        self._created_dirs = set()
+        self._filename_templates = {}
         if self.write_csv or self.write_parquet:
             self.timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
             ftypes = []
-            if config["seir"].exists():
+            if "seir" in config_sections:
                 ftypes.extend(["seir", "spar", "snpi"])
-            if config["outcomes"].exists():
+            if "outcomes" in config_sections:
                 ftypes.extend(["hosp", "hpar", "hnpi"])
             for ftype in ftypes:
                 datadir = file_paths.create_dir_name(
@@ -225,6 +284,7 @@ class ModelInfo:
                     inference_filepath_suffix=inference_filepath_suffix,
                 )
                 os.makedirs(datadir, exist_ok=True)
+                self._created_dirs.add(os.path.normpath(datadir))
 
             if self.write_parquet and self.write_csv:
                 print("Confused between reading .csv or parquet. Assuming input file is .parquet")
@@ -235,8 +295,94 @@ class ModelInfo:
 
         self.config_filepath = config_filepath  # useful for plugins
 
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return self.time_setup.dates
+
+    @functools.cached_property
+    def parameters(self):
+        if self.seir_config is None:
+            raise AttributeError("ModelInfo has no parameters without a 'seir:' section in config")
+        from . import parameters
+
+        return _cached_model_spec(
+            (
+                "parameters",
+                repr(self.parameters_config.get()),
+                self.ti,
+                self.tf,
+                tuple(self.subpop_struct.subpop_names),
+                _referenced_files(self.parameters_config.get(), self.path_prefix),
+            ),
+            lambda: parameters.Parameters(
+                parameter_config=self.parameters_config,
+                ti=self.ti,
+                tf=self.tf,
+                subpop_names=self.subpop_struct.subpop_names,
+                path_prefix=self.path_prefix,
+            ),
+        )
+
+    @functools.cached_property
+    def seeding(self):
+        if self.seir_config is None:
+            raise AttributeError("ModelInfo has no seeding without a 'seir:' section in config")
+        from . import seeding
+
+        return seeding.SeedingFactory(config=self.seeding_config, path_prefix=self.path_prefix)
+
+    @functools.cached_property
+    def initial_conditions(self):
+        if self.seir_config is None:
+            raise AttributeError("ModelInfo has no initial_conditions without a 'seir:' section in config")
+        from . import initial_conditions
+
+        return initial_conditions.InitialConditionsFactory(
+            config=self.initial_conditions_config, path_prefix=self.path_prefix
+        )
+
+    @functools.cached_property
+    def compartments(self):
+        # really ugly references to the config globally here.
+        if self.seir_config is None or self.compartments_config is None:
+            raise AttributeError("ModelInfo has no compartments without 'seir:' and 'compartments:' sections in config")
+        from . import compartments
+
+        return _cached_model_spec(
+            ("compartments", repr(self.seir_config.get()), repr(self.compartments_config.get())),
+            lambda: compartments.Compartments(seir_config=self.seir_config, compartments_config=self.compartments_config),
+        )
+
+    def warmup(self):
+        """
+        Compile the module-level numba kernels of the simulations (the rk4 seeding step and the outcomes delay
+        shift) on zero-size inputs with the dtypes of a simulation, so that the compilation, or the load from the
+        on-disk cache, happens here once per process instead of during the first simulation. The rk4 right-hand
+        side and step are closures over the model, compiled by each integration, and cannot be warmed up.
+        Does not build any of the model components.
+        """
+        from . import outcomes, steps_rk4  # outcomes imports model_info
+
+        no_seeding = np.zeros(0, dtype=np.int64)
+        steps_rk4.apply_seeding(
+            np.zeros((0, self.nsubpops)),
+            np.zeros((1, 0, self.nsubpops)),
+            0,
+            np.int64(0),  # start and stop are read from the int64 day_start_idx
+            np.int64(0),
+            no_seeding,
+            no_seeding,
+            no_seeding,
+            np.zeros(0),
+        )
+        outcomes.multishift(
+            np.zeros((0, self.nsubpops), dtype=np.float64),
+            np.zeros((0, self.nsubpops), dtype=np.int64),
+            stoch_delay_flag=False,
+        )
+
     def get_input_filename(self, ftype: str, sim_id: int, extension_override: str = ""):
-        return self.path_prefix / self.get_filename(
+        return self.get_filename(
             ftype=ftype,
             sim_id=sim_id,
             input=True,
@@ -244,15 +390,15 @@ class ModelInfo:
         )
 
     def get_output_filename(self, ftype: str, sim_id: int, extension_override: str = ""):
-        return self.path_prefix / self.get_filename(
+        return self.get_filename(
             ftype=ftype,
             sim_id=sim_id,
             input=False,
             extension_override=extension_override,
         )
 
-    def get_filename(self, ftype: str, sim_id: int, input: bool, extension_override: str = ""):
-        """return a CSP formated filename."""
+    def get_filename(self, ftype: str, sim_id: int, input: bool, extension_override: str = "") -> str:
+        """return a CSP formated filename, under path_prefix."""
 
         if extension_override:  # empty strings are Falsy
             extension = extension_override
@@ -266,16 +412,29 @@ class ModelInfo:
             run_id = self.out_run_id
             prefix = self.out_prefix
 
-        fn = self.path_prefix / file_paths.create_file_name(
-            run_id=run_id,
-            prefix=prefix,
-            index=sim_id + self.first_sim_index - 1,
-            inference_filepath_suffix=self.inference_filepath_suffix,
-            inference_filename_prefix=self.inference_filename_prefix,
-            ftype=ftype,
-            extension=extension,
+        # directories are created by __init__ and write_simID, not on every filename lookup
+        return self._filename_template(run_id, prefix).format(
+            ftype=ftype, index=sim_id + self.first_sim_index - 1, extension=extension
         )
-        return fn
+
+    def _filename_template(self, run_id: str, prefix: str) -> str:
+        """
+        str.format template (fields: ftype, index, extension) of the filenames of a run_id and prefix, i.e. what
+        file_paths.create_file_name returns, under path_prefix. Built once per (run_id, prefix, ...) as the prefixes
+        and run_ids may be changed after construction (e.g. by GempyorInference).
+        """
+        key = (run_id, prefix, self.inference_filepath_suffix, self.inference_filename_prefix, self._path_prefix_str)
+        template = self._filename_templates.get(key)
+        if template is None:
+            template = os.path.join(
+                self._path_prefix_str.replace("{", "{{").replace("}", "}}"),
+                file_paths.create_file_name_template(
+                    run_id, prefix, self.inference_filepath_suffix, self.inference_filename_prefix
+                )
+                + ".{extension}",
+            )
+            self._filename_templates[key] = template
+        return template
 
     def get_setup_name(self):
         return self.setup_name
@@ -290,6 +449,32 @@ class ModelInfo:
         # print(f"Readings {fname}")
         return read_df(fname=fname)
 
+    def read_simID_arrow(self, ftype: str, sim_id: int, input: bool = True) -> "pyarrow.Table":
+        """
+        Read a parquet file as a memory-mapped pyarrow Table, without the pandas conversion of read_simID.
+        Numeric columns can then be handed to numpy (e.g. table.column("value").to_numpy()) without copy.
+        """
+        import pyarrow.parquet as pq
+
+        fname = self.get_filename(ftype=ftype, sim_id=sim_id, input=input, extension_override="parquet")
+        return pq.read_table(fname, memory_map=True)
+
+    def read_simIDs(self, ftypes: list, sim_id: int, input: bool = True, extension_override: str = "") -> dict:
+        """
+        Read the files of several ftypes for the same sim_id, as a dict ftype -> DataFrame.
+        The files are read concurrently by threads, as parquet/csv reading mostly releases the GIL.
+        """
+        import concurrent.futures
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(8, len(ftypes)))) as executor:
+            futures = {
+                ftype: executor.submit(
+                    self.read_simID, ftype=ftype, sim_id=sim_id, input=input, extension_override=extension_override
+                )
+                for ftype in ftypes
+            }
+            return {ftype: future.result() for ftype, future in futures.items()}
+
     def write_simID(
         self,
         ftype: str,
@@ -305,11 +490,21 @@ class ModelInfo:
             extension_override=extension_override,
         )
         # create the directory if it does exists:
-        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        datadir = os.path.normpath(os.path.dirname(fname))
+        if datadir not in self._created_dirs:
+            os.makedirs(datadir, exist_ok=True)
+            self._created_dirs.add(datadir)
 
         # print(f"Writing {fname}")
-        write_df(
-            fname=fname,
-            df=df,
-        )
+        try:
+            write_df(
+                fname=fname,
+                df=df,
+            )
+        except FileNotFoundError:  # the directory was removed since we created it (e.g. calibrate cleans model_output/)
+            os.makedirs(datadir, exist_ok=True)
+            write_df(
+                fname=fname,
+                df=df,
+            )
         return fname
@@ -568,7 +568,7 @@ def filter_seir_xr(diffI, dates, subpops, filters, outcome_name) -> np.ndarray:
     return incidI_arr.to_numpy()
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def shift(arr, num, fill_value=0):
     """
     Quite fast shift implementation, along the first axis,
@@ -614,7 +614,7 @@ def multishiftee(arr, shifts, stoch_delay_flag=True):
     return result
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def multishift(arr, shifts, stoch_delay_flag=True):
     """Shift along first (0) axis"""
     result = np.zeros_like(arr)
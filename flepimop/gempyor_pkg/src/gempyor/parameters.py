@@ -2,6 +2,7 @@ import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
+import pyarrow.csv as pv
 import copy
 import confuse
 from numpy import ndarray
@@ -24,6 +25,26 @@ logger = logging.getLogger(__name__)
 ## TODO: ideally here path_prefix should not be used and all files loaded from modinf
 
 
+def _read_timeseries(fname: str) -> pd.DataFrame:
+    """Load a parameter timeseries file. Csv files are parsed by the multithreaded pyarrow reader, which is much
+    faster than pandas on these wide numeric tables; the subpop names stay strings as they are the column names.
+    It accepts what utils.read_df does: the dates are left as strings for the caller's pd.to_datetime (any
+    format it parses), the column names are stripped as with skipinitialspace, and the files pyarrow cannot
+    parse are read by utils.read_df."""
+    if str(fname).split(".")[-1] == "csv":
+        try:
+            table = pv.read_csv(fname, convert_options=pv.ConvertOptions(column_types={"date": pa.string()}))
+        except pa.ArrowInvalid:
+            return utils.read_df(fname)
+        values = [field.type for field in table.schema if field.name != "date"]
+        if not all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in values):
+            return utils.read_df(fname)  # e.g. padded values that pyarrow kept as strings
+        df = table.to_pandas()
+        df.columns = df.columns.str.strip()
+        return df
+    return utils.read_df(fname)
+
+
 class Parameters:
     # Minimal object to be easily picklable for // runs
     def __init__(
@@ -43,6 +64,8 @@ class Parameters:
         self.pnames2pindex = {}
         self.stacked_modifier_method = {"sum": [], "product": [], "reduction_product": []}
 
+        n_days = (tf - ti).days + 1
+
         self.pnames = self.pconfig.keys()
         self.npar = len(self.pnames)
         if self.npar != len(set([name.lower() for name in self.pnames])):
@@ -61,7 +84,7 @@ class Parameters:
             # Parameter given as a file
             elif self.pconfig[pn]["timeseries"].exists():
                 fn_name = os.path.join(path_prefix, self.pconfig[pn]["timeseries"].get())
-                df = utils.read_df(fn_name).set_index("date")
+                df = _read_timeseries(fn_name).set_index("date")
                 df.index = pd.to_datetime(df.index)
                 if len(df.columns) == 1:  # if only one ts, assume it applies to all subpops
                     df = pd.DataFrame(
@@ -78,25 +101,30 @@ class Parameters:
                     columns are {len(df.columns)}, expected {len(subpop_names)} (the number of subpops) or one."""
                     )
 
-                df = df[str(ti) : str(tf)]
-                if not (len(df.index) == len(pd.date_range(ti, tf))):
+                # day offsets from ti of the loaded rows, compared as integers to the days of the config time span;
+                # the rows within [ti, tf] are selected with the same offsets instead of a date-string slice
+                day_idx = (df.index.to_numpy().astype("datetime64[D]") - np.datetime64(ti, "D")).astype(np.int64)
+                in_span = (day_idx >= 0) & (day_idx < n_days)
+                df = df.iloc[np.flatnonzero(in_span)]
+                day_idx = day_idx[in_span]
+                if not (len(day_idx) == n_days):
                     print("config dates:", pd.date_range(ti, tf))
                     print("loaded dates:", df.index)
                     raise ValueError(
                         f"""ERROR loading file {fn_name} for parameter {pn}: 
                     the 'date' entries of the provided file do not include all the days specified to be modeled by 
                     the config. the provided file includes {len(df.index)} days between {str(df.index[0])} to {str(df.index[-1])}, 
-                    while there are {len(pd.date_range(ti, tf))} days in the config time span of {ti}->{tf}. The file must contain entries for the
+                    while there are {n_days} days in the config time span of {ti}->{tf}. The file must contain entries for the
                     the exact start and end dates from the config. """
                     )
-                if not (pd.date_range(ti, tf) == df.index).all():
+                if not (day_idx == np.arange(n_days)).all():
                     print("config dates:", pd.date_range(ti, tf))
                     print("loaded dates:", df.index)
                     raise ValueError(
                         f"""ERROR loading file {fn_name} for parameter {pn}: 
                     the 'date' entries of the provided file do not include all the days specified to be modeled by 
                     the config. the provided file includes {len(df.index)} days between {str(df.index[0])} to {str(df.index[-1])}, 
-                    while there are {len(pd.date_range(ti, tf))} days in the config time span of {ti}->{tf}. The file must contain entries for the
+                    while there are {n_days} days in the config time span of {ti}->{tf}. The file must contain entries for the
                     the exact start and end dates from the config. """
                     )
 
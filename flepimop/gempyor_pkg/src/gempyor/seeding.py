@@ -19,48 +19,22 @@ def _DataFrame2NumbaDict(df, amounts, modinf) -> nb.typed.Dict:
     if not df["date"].is_monotonic_increasing:
         raise ValueError("_DataFrame2NumbaDict got an unsorted dataframe, exposing itself to non-sense")
 
-    cmp_grp_names = [col for col in modinf.compartments.compartments.columns if col != "name"]
-    seeding_dict: nb.typed.Dict = nb.typed.Dict.empty(
-        key_type=nb.types.unicode_type,
-        value_type=nb.types.int64[:],
-    )
-    seeding_dict["seeding_sources"] = np.zeros(len(amounts), dtype=np.int64)
-    seeding_dict["seeding_destinations"] = np.zeros(len(amounts), dtype=np.int64)
-    seeding_dict["seeding_subpops"] = np.zeros(len(amounts), dtype=np.int64)
-    seeding_amounts = np.zeros(len(amounts), dtype=np.float64)
-
-    nb_seed_perday = np.zeros(modinf.n_days, dtype=np.int64)
-
-    n_seeding_ignored_before = 0
-    n_seeding_ignored_after = 0
-
-    # id_seed = 0
-    for idx, (row_index, row) in enumerate(df.iterrows()):
-        if row["subpop"] not in modinf.subpop_struct.subpop_names:
-            logging.debug(
-                f"Invalid subpop '{row['subpop']}' in row {row_index + 1} of seeding::lambda_file. Not found in geodata... Skipping"
-            )
-        elif (row["date"].date() - modinf.ti).days >= 0:
-            if (row["date"].date() - modinf.ti).days < len(nb_seed_perday):
-                nb_seed_perday[(row["date"].date() - modinf.ti).days] = (
-                    nb_seed_perday[(row["date"].date() - modinf.ti).days] + 1
-                )
-                source_dict = {grp_name: row[f"source_{grp_name}"] for grp_name in cmp_grp_names}
-                destination_dict = {grp_name: row[f"destination_{grp_name}"] for grp_name in cmp_grp_names}
-                seeding_dict["seeding_sources"][idx] = modinf.compartments.get_comp_idx(
-                    source_dict, error_info=f"(seeding source at idx={idx}, row_index={row_index}, row=>>{row}<<)"
-                )
-                seeding_dict["seeding_destinations"][idx] = modinf.compartments.get_comp_idx(
-                    destination_dict,
-                    error_info=f"(seeding destination at idx={idx}, row_index={row_index}, row=>>{row}<<)",
-                )
-                seeding_dict["seeding_subpops"][idx] = modinf.subpop_struct.subpop_names.index(row["subpop"])
-                seeding_amounts[idx] = amounts[idx]
-                # id_seed+=1
-            else:
-                n_seeding_ignored_after += 1
-        else:
-            n_seeding_ignored_before += 1
+    # Columns are resolved for all rows at once into parallel arrays (one per key); the numba dictionnary then only
+    # receives these few arrays instead of being filled row by row.
+    amounts = np.asarray(amounts, dtype=np.float64)
+    subpop_idx = pd.Index(modinf.subpop_struct.subpop_names).get_indexer(df["subpop"])
+    day = (
+        pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]") - np.datetime64(modinf.ti, "D")
+    ).astype(np.int64)
+
+    invalid_subpop = subpop_idx < 0
+    for row_index in np.flatnonzero(invalid_subpop):
+        logging.debug(
+            f"Invalid subpop '{df['subpop'].iloc[row_index]}' in row {row_index + 1} of seeding::lambda_file. Not found in geodata... Skipping"
+        )
+    n_seeding_ignored_before = np.count_nonzero(~invalid_subpop & (day < 0))
+    n_seeding_ignored_after = np.count_nonzero(~invalid_subpop & (day >= modinf.n_days))
+    keep = ~invalid_subpop & (day >= 0) & (day < modinf.n_days)
 
     if n_seeding_ignored_before > 0:
         logging.critical(
@@ -71,13 +45,39 @@ def _DataFrame2NumbaDict(df, amounts, modinf) -> nb.typed.Dict:
             f"Seeding ignored {n_seeding_ignored_after} rows because they were after the end of the simulation."
         )
 
-    day_start_idx = np.zeros(modinf.n_days + 1, dtype=np.int64)
-    day_start_idx[1:] = np.cumsum(nb_seed_perday)
-    seeding_dict["day_start_idx"] = day_start_idx
+    kept = df[keep]
+    seeding_dict: nb.typed.Dict = nb.typed.Dict.empty(
+        key_type=nb.types.unicode_type,
+        value_type=nb.types.int64[:],
+    )
+    seeding_dict["seeding_sources"] = _compartment_indices(kept, "source", modinf)
+    seeding_dict["seeding_destinations"] = _compartment_indices(kept, "destination", modinf)
+    seeding_dict["seeding_subpops"] = subpop_idx[keep].astype(np.int64)
+    seeding_amounts = amounts[keep]
+
+    # rows are sorted by day, so the rows of day d are the [day_start_idx[d], day_start_idx[d + 1]) range
+    seeding_dict["day_start_idx"] = np.searchsorted(day[keep], np.arange(modinf.n_days + 1)).astype(np.int64)
 
     return seeding_dict, seeding_amounts
 
 
+def _compartment_indices(df, prefix, modinf) -> np.ndarray:
+    """
+    Compartment index of each row of the seeding dataframe, for the `source` or `destination` prefix.
+    get_comp_idx is only called once per distinct compartment, not once per row.
+    """
+    if df.empty:
+        return np.zeros(0, dtype=np.int64)
+    cmp_grp_names = [col for col in modinf.compartments.compartments.columns if col != "name"]
+    comp = pd.MultiIndex.from_frame(df[[f"{prefix}_{grp_name}" for grp_name in cmp_grp_names]])
+    unique_comp = comp.unique()
+    unique_idx = np.zeros(len(unique_comp), dtype=np.int64)
+    for i, values in enumerate(unique_comp):
+        comp_dict = dict(zip(cmp_grp_names, values))
+        unique_idx[i] = modinf.compartments.get_comp_idx(comp_dict, error_info=f"(seeding {prefix} {comp_dict})")
+    return unique_idx[unique_comp.get_indexer(comp)]
+
+
 class Seeding(SimulationComponent):
     def __init__(self, config: confuse.ConfigView, path_prefix: str = "."):
         self.seeding_config = config
@@ -100,8 +100,7 @@ class Seeding(SimulationComponent):
                 raise ValueError(f"Repeated subpop-date in rows {dupes.tolist()} of seeding::lambda_file.")
         elif method == "FolderDraw":
             seeding = pd.read_csv(
-                self.path_prefix
-                / modinf.get_input_filename(
+                modinf.get_input_filename(
                     ftype=modinf.seeding_config["seeding_file_type"].get(),
                     sim_id=sim_id,
                     extension_override="csv",
@@ -19,6 +19,25 @@ proportion_exponent_col = 2
 float_tolerance = 1e-9
 
 
+@jit(nopython=True, nogil=True, cache=True)
+def apply_seeding(
+    states_next, states_daily_incid, today, start, stop, seeding_sources, seeding_destinations, seeding_subpops, amounts
+):
+    """Apply the seeding instances [start, stop) to states_next, and count them in the incidence of today."""
+    for seeding_instance_idx in range(start, stop):
+        this_seeding_amounts = amounts[seeding_instance_idx]
+        seeding_subpops_idx = seeding_subpops[seeding_instance_idx]
+        seeding_sources_idx = seeding_sources[seeding_instance_idx]
+        seeding_destinations_idx = seeding_destinations[seeding_instance_idx]
+        states_next[seeding_sources_idx, seeding_subpops_idx] -= this_seeding_amounts
+        if states_next[seeding_sources_idx, seeding_subpops_idx] < 0:
+            states_next[seeding_sources_idx, seeding_subpops_idx] = 0
+        states_next[seeding_destinations_idx, seeding_subpops_idx] += this_seeding_amounts
+
+        # ADD TO cumulative, this is debatable,
+        states_daily_incid[today, seeding_destinations_idx, seeding_subpops_idx] += this_seeding_amounts
+
+
 def rk4_integration(
     *,
     ncompartments,  # 1
@@ -60,7 +79,8 @@ def rk4_integration(
             1,
         )
 
-    @jit(nopython=True)
+    # the kernels release the GIL, so that independent integrations can run concurrently on threads
+    @jit(nopython=True, nogil=True)
     def rhs(t, x, today):
         states_current = np.reshape(x, (2, ncompartments, nspatial_nodes))[0]
         st_next = states_current.copy()  # this is used to make sure stochastic integration never goes below zero
@@ -160,7 +180,7 @@ def rk4_integration(
         #    if number_move[spatial_node] > states_current[transitions[transition_source_col][transition_index]][spatial_node]:
         #        number_move[spatial_node] = states_current[transitions[transition_source_col][transition_index]][spatial_node]
 
-    @jit(nopython=True)
+    @jit(nopython=True, nogil=True)
     def update_states(states, delta_t, transition_amounts):
         states_diff = np.zeros((2, ncompartments, nspatial_nodes))  # first dim: 0 -> states_diff, 1: states_cum
         st_next = states.copy()
@@ -203,7 +223,7 @@ def rk4_integration(
 
         return states + np.reshape(states_diff, states_diff.size)
 
-    @jit(nopython=True, fastmath=True)
+    @jit(nopython=True, nogil=True, fastmath=True)
     def rk4_integrate(t, x, today):
         k1 = rhs(t, x, today)
         k2 = rhs(t + dt / 2, update_states(x, dt / 2, k1), today)
@@ -211,6 +231,13 @@ def rk4_integration(
         k4 = rhs(t + dt, update_states(x, dt, k3), today)
         return update_states(x, dt / 6, (k1 + 2 * k2 + 2 * k3 + k4))
 
+    # looked up once: the typed dict is not read inside the time loop
+    day_start_idx = seeding_data["day_start_idx"]
+    seeding_sources = seeding_data["seeding_sources"]
+    seeding_destinations = seeding_data["seeding_destinations"]
+    seeding_subpops = seeding_data["seeding_subpops"]
+    seeding_amounts = np.asarray(seeding_amounts, dtype=np.float64)
+
     yesterday = -1
     times = np.arange(0, (ndays - 1) + 1e-7, dt)
 
@@ -222,23 +249,17 @@ def rk4_integration(
         if is_a_new_day:
             # Prevalence is saved at the begining of the day, while incidence is during the day
             states[today, :, :] = states_next
-            for seeding_instance_idx in range(
-                seeding_data["day_start_idx"][today],
-                seeding_data["day_start_idx"][min(today + int(np.ceil(dt)), len(seeding_data["day_start_idx"]) - 1)],
-            ):
-                this_seeding_amounts = seeding_amounts[seeding_instance_idx]
-                seeding_subpops = seeding_data["seeding_subpops"][seeding_instance_idx]
-                seeding_sources = seeding_data["seeding_sources"][seeding_instance_idx]
-                seeding_destinations = seeding_data["seeding_destinations"][seeding_instance_idx]
-                # this_seeding_amounts = this_seeding_amounts < states_next[seeding_sources] ?  this_seeding_amounts : states_next[seeding_instance_idx]
-                states_next[seeding_sources][seeding_subpops] -= this_seeding_amounts
-                states_next[seeding_sources][seeding_subpops] = states_next[seeding_sources][seeding_subpops] * (
-                    states_next[seeding_sources][seeding_subpops] > 0
-                )
-                states_next[seeding_destinations][seeding_subpops] += this_seeding_amounts
-
-                # ADD TO cumulative, this is debatable,
-                states_daily_incid[today][seeding_destinations][seeding_subpops] += this_seeding_amounts
+            apply_seeding(
+                states_next,
+                states_daily_incid,
+                today,
+                day_start_idx[today],
+                day_start_idx[min(today + int(np.ceil(dt)), len(day_start_idx) - 1)],
+                seeding_sources,
+                seeding_destinations,
+                seeding_subpops,
+                seeding_amounts,
+            )
 
         x_ = np.zeros((2, ncompartments, nspatial_nodes))
         x_[0] = states_next
@@ -92,13 +92,14 @@ class SubpopulationStructure:
                 )
 
             # Make sure mobility values <= the population of src subpop
-            tmp = (self.mobility.T - self.subpop_pop).T
-            tmp[tmp < 0] = 0
-            if tmp.any():
-                rows, cols, values = scipy.sparse.find(tmp)
+            # (checked on the stored entries only: subtracting the populations from the sparse matrix makes it dense)
+            mobility_csr = self.mobility.tocsr()
+            entry_rows = np.repeat(np.arange(mobility_csr.shape[0]), np.diff(mobility_csr.indptr))
+            exceeding = mobility_csr.data > self.subpop_pop[entry_rows]
+            if exceeding.any():
                 errmsg = ""
-                for r, c, v in zip(rows, cols, values):
-                    errmsg += f"\n({r}, {c}) = {self.mobility[r, c]} > population of '{self.subpop_names[r]}' = {self.subpop_pop[r]}"
+                for r, c, v in zip(entry_rows[exceeding], mobility_csr.indices[exceeding], mobility_csr.data[exceeding]):
+                    errmsg += f"\n({r}, {c}) = {v} > population of '{self.subpop_names[r]}' = {self.subpop_pop[r]}"
                 raise ValueError(
                     f"The following entries in the mobility data exceed the source subpop populations in geodata:{errmsg}"
                 )
@@ -115,7 +116,7 @@ class SubpopulationStructure:
                 )
         else:
             logging.critical("No mobility matrix specified -- assuming no one moves")
-            self.mobility = scipy.sparse.csr_matrix(np.zeros((self.nsubpops, self.nsubpops)), dtype=int)
+            self.mobility = scipy.sparse.csr_matrix((self.nsubpops, self.nsubpops), dtype=int)
 
         if subpop_config["selected"].exists():
             selected = subpop_config["selected"].get()
@@ -3,10 +3,12 @@ import datetime
 import functools
 import numbers
 import time
+import typing
 import confuse
 import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.parquet
 import scipy.stats
 import sympy.parsing.sympy_parser
 import subprocess
@@ -22,17 +24,23 @@ logger = logging.getLogger(__name__)
 config = confuse.Configuration("flepiMoP", read=False)
 
 
-def write_df(fname: str, df: pd.DataFrame, extension: str = ""):
-    """write without index, so assume the index has been put a column"""
+def write_df(fname: str, df: typing.Union[pd.DataFrame, dict], extension: str = ""):
+    """write without index, so assume the index has been put a column.
+    df can also be a dict of column name -> array, which is written to parquet without a pandas intermediary"""
     # cast to str to use .split in case fname is a PosixPath
     fname = str(fname)
     if extension:  # Empty strings are falsy in python
         fname = f"{fname}.{extension}"
     extension = fname.split(".")[-1]
     if extension == "csv":
+        if isinstance(df, dict):
+            df = pd.DataFrame(df)
         df.to_csv(fname, index=False)
     elif extension == "parquet":
-        df = pa.Table.from_pandas(df, preserve_index=False)
+        if isinstance(df, dict):
+            df = pa.Table.from_pydict(df)
+        else:
+            df = pa.Table.from_pandas(df, preserve_index=False)
         pa.parquet.write_table(df, fname)
     else:
         raise NotImplementedError(f"Invalid extension {extension}. Must be 'csv' or 'parquet'")
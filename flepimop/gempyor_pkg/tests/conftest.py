@@ -0,0 +1,14 @@
+import os
+import pytest
+
+
+@pytest.fixture(scope="module", autouse=True)
+def chdir_to_test_dir(request):
+    """
+    Run the tests of each module from the module's directory, as the configs refer to their data files relative to
+    it. Set per module, instead of by an os.chdir at import, so that it does not depend on which modules were
+    collected (or run) before, e.g. on a pytest-xdist worker.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(os.path.dirname(request.module.__file__))
+        yield
@@ -1,6 +1,7 @@
 import pytest
 import datetime
 import os
+import numpy as np
 import pandas as pd
 
 # import dask.dataframe as dd
@@ -14,14 +15,15 @@ from gempyor.utils import config
 TEST_SETUP_NAME = "minimal_test"
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
 
 tmp_path = "/tmp"
 
+# the tests write to the same model_output
+pytestmark = pytest.mark.xdist_group(name="inference")
+
 
 class TestGempyorInference:
     def test_GempyorInference_success(self):
-        os.chdir(os.path.dirname(__file__))
         # the minimum model test, choices are: npi_scenario="None"
         #     config.set_file(f"{DATA_DIR}/config_min_test.yml")
         #     i = inference.GempyorInference(config_filepath=f"{DATA_DIR}/config.yml", npi_scenario="None")
@@ -64,3 +66,26 @@ class TestGempyorInference:
 
         i.already_built = False
         i.one_simulation(sim_id2write=0, parallel=True)
+
+    def test_InferenceParameters_check_in_bound_batch(self):
+        from gempyor.inference_parameter import InferenceParameters
+
+        config.clear()
+        config.read(user=False)
+        inferpar = InferenceParameters(global_config=config, subpop_names=["01", "02"])
+        for sp in ["01", "02"]:
+            inferpar.add_single_parameter(ptype="seir_modifiers", pname="lockdown", subpop=sp, pdist=None, lb=0.0, ub=0.9)
+
+        proposals = np.array(
+            [
+                [0.1, 0.5],  # inside
+                [0.0, 0.9],  # on the bounds
+                [-0.1, 0.5],  # below the lower bound
+                [0.5, 1.2],  # above the upper bound
+                [-0.5, 2.0],  # both
+            ]
+        )
+        in_bounds = inferpar.check_in_bound_batch(proposals=proposals)
+        assert in_bounds.tolist() == [inferpar.check_in_bound(proposal=p) for p in proposals]
+        assert in_bounds.tolist() == [True, True, False, False, False]
+        assert inferpar.check_in_bound_batch(proposals=proposals[0]).tolist() == [True]
@@ -10,7 +10,6 @@ from gempyor import NPI, model_info
 from gempyor.utils import config
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
 
 
 class Test_SinglePeriodModifier:
@@ -114,3 +113,34 @@ class Test_SinglePeriodModifier:
 
         # Test
         test._SinglePeriodModifier__checkErrors()
+
+        # all the invalid subpops are reported, in a deterministic order
+        test.affected_subpops = {"99999", s.subpop_struct.subpop_names[0], "00000"}
+        with pytest.raises(ValueError, match=r"^Invalid config value 00000, 99999 not in subpops$"):
+            test._SinglePeriodModifier__checkErrors()
+
+    def test_SinglePeriodModifier_npi_is_kept(self):
+        config.clear()
+        config.read(user=False)
+        config.set_file(f"{DATA_DIR}/config_test.yml")
+        s = model_info.ModelInfo(
+            setup_name="test_seir",
+            config=config,
+            nslots=1,
+            seir_modifiers_scenario="None",
+            outcome_modifiers_scenario=None,
+            write_csv=False,
+        )
+
+        test = NPI.SinglePeriodModifier(
+            npi_config=s.npi_config_seir,
+            modinf=s,
+            modifiers_library="",
+            subpops=s.subpop_struct.subpop_names,
+            loaded_df=None,
+        )
+
+        assert test.getReduction(test.param_name) is test.npi
+        # in-place edits through the frame are seen by the reductions
+        test.npi.iloc[0, 0] = 0.5
+        assert test.getReduction(test.param_name).iloc[0, 0] == 0.5
@@ -20,12 +20,11 @@ from gempyor import file_paths, outcomes, seir
 
 config_filepath_prefix = ""
 
-os.chdir(os.path.dirname(__file__))
+# the tests chain the hnpi/snpi files of runs 105, 106 and 107 in model_output
+pytestmark = pytest.mark.xdist_group(name="npi")
 
 
 def test_full_npis_read_write():
-    os.chdir(os.path.dirname(__file__))
-
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config_npi.yml",
         run_id=105,
@@ -238,3 +237,25 @@ def test_spatial_groups():
     assert (npi_wrote.getReduction("r3") == npi_read.getReduction("r3")).all().all()
     assert (npi_wrote.getReduction("r4") == npi_read.getReduction("r4")).all().all()
     assert (npi_wrote.getReduction("r5") == npi_read.getReduction("r5")).all().all()
+
+
+@pytest.mark.parametrize("method", ["product", "reduction_product", "sum"])
+def test_reduce_parameter_kernel_matches_pandas(method):
+    dates = pd.date_range("2020-04-01", "2020-04-10")
+    rng = np.random.default_rng(0)
+    modification = pd.DataFrame(rng.uniform(size=(3, len(dates))), index=["01", "02", "03"], columns=dates)
+    modification.iloc[1, 4] = np.nan
+    parameter = rng.uniform(size=(len(dates), 3))
+    parameter[7, 2] = np.nan
+
+    # the pandas computation the kernel replaced
+    daily = modification.T.resample("1D").ffill()
+    expected = {
+        "product": parameter * daily,
+        "reduction_product": parameter * (1 - daily),
+        "sum": parameter + daily,
+    }[method].to_numpy()
+
+    reduced = gempyor.NPI.helpers.reduce_parameter(parameter, modification, method=method)
+    np.testing.assert_array_equal(reduced, expected)
+    assert np.isnan(reduced[4, 1]) and np.isnan(reduced[7, 2])
@@ -20,6 +20,9 @@ from gempyor import file_paths, model_info, outcomes
 
 config_filepath_prefix = ""  #'tests/outcomes/'
 
+# these tests, and the ones of test_outcomes0, read the model_output files written by the earlier ones
+pytestmark = pytest.mark.xdist_group(name="outcomes")
+
 ### To generate files for this test, see notebook Test Outcomes  playbook.ipynb in COVID19_Maryland
 
 subpop = ["15005", "15007", "15009", "15001", "15003"]
@@ -27,11 +30,7 @@ diffI = np.arange(5) * 2
 date_data = datetime.date(2020, 4, 15)
 
 
-os.chdir(os.path.dirname(__file__))
-
-
 def test_outcome():
-    os.chdir(os.path.dirname(__file__))  ## this is redundant but necessary. Why ?
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config.yml",
         run_id=1,
@@ -127,7 +126,6 @@ def test_outcome():
 
 
 def test_outcome_modifiers_scenario_with_load():
-    os.chdir(os.path.dirname(__file__))
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config_load.yml",
         run_id=2,
@@ -159,7 +157,6 @@ def test_outcome_modifiers_scenario_with_load():
 
 
 def test_outcomes_read_write_hpar():
-    os.chdir(os.path.dirname(__file__))
     config.clear()
     config.read(user=False)
 
@@ -185,7 +182,6 @@ def test_outcomes_read_write_hpar():
 
 
 def test_multishift_notstochdelays():
-    os.chdir(os.path.dirname(__file__))
     shp = (10, 2)  # dateXplace
     array = np.array(
         [
@@ -220,8 +216,6 @@ def test_multishift_notstochdelays():
 
 
 def test_outcomes_npi():
-    os.chdir(os.path.dirname(__file__))
-
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config_npi.yml",
         run_id=1,
@@ -319,8 +313,6 @@ def test_outcomes_npi():
 
 
 def test_outcomes_read_write_hnpi():
-    os.chdir(os.path.dirname(__file__))
-
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config_npi.yml",
         run_id=105,
@@ -345,8 +337,6 @@ def test_outcomes_read_write_hnpi():
 
 
 def test_outcomes_read_write_hnpi2():
-    os.chdir(os.path.dirname(__file__))
-
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config_npi.yml",
         run_id=105,
@@ -392,8 +382,6 @@ def test_outcomes_read_write_hnpi2():
 
 
 def test_outcomes_npi_custom_pname():
-    os.chdir(os.path.dirname(__file__))
-
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config_npi_custom_pnames.yml",
         run_id=1,
@@ -491,8 +479,6 @@ def test_outcomes_npi_custom_pname():
 
 
 def test_outcomes_read_write_hnpi_custom_pname():
-    os.chdir(os.path.dirname(__file__))
-
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config_npi_custom_pnames.yml",
         run_id=105,
@@ -516,8 +502,6 @@ def test_outcomes_read_write_hnpi_custom_pname():
 
 
 def test_outcomes_read_write_hnpi2_custom_pname():
-    os.chdir(os.path.dirname(__file__))
-
     prefix = ""
 
     hnpi_read = pq.read_table(f"{config_filepath_prefix}model_output/hnpi/000000001.105.hnpi.parquet").to_pandas()
@@ -567,7 +551,6 @@ def test_outcomes_read_write_hnpi2_custom_pname():
 
 
 def test_outcomes_pcomp():
-    os.chdir(os.path.dirname(__file__))
     prefix = ""
 
     inference_simulator = gempyor.GempyorInference(
@@ -716,8 +699,6 @@ def test_outcomes_pcomp():
 
 
 def test_outcomes_pcomp_read_write():
-    os.chdir(os.path.dirname(__file__))
-
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config_mc_selection.yml",
         run_id=111,
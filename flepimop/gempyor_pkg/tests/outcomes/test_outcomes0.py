@@ -20,17 +20,17 @@ from gempyor import file_paths, model_info, outcomes
 
 config_filepath_prefix = ""  #'tests/outcomes/'
 
+# shares model_output with test_outcomes
+pytestmark = pytest.mark.xdist_group(name="outcomes")
+
 ### To generate files for this test, see notebook Test Outcomes  playbook.ipynb in COVID19_Maryland
 
 geoid = ["15005", "15007", "15009", "15001", "15003"]
 diffI = np.arange(5) * 2
 date_data = datetime.date(2020, 4, 15)
 
-os.chdir(os.path.dirname(__file__))
-
 
 def test_outcome_scenario():
-    os.chdir(os.path.dirname(__file__))  ## this is redundant but necessary. Why ?
     inference_simulator = gempyor.GempyorInference(
         config_filepath=f"{config_filepath_prefix}config.yml",
         run_id=1,
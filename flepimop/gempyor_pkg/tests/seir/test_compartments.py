@@ -15,7 +15,6 @@ from gempyor import compartments, seir, NPI, file_paths, model_info, subpopulati
 from gempyor.utils import config
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
 
 
 def test_check_transitions_parquet_creation():
@@ -61,7 +60,6 @@ def test_check_transitions_parquet_writing_and_loading():
 
 
 def test_ModelInfo_has_compartments_component():
-    os.chdir(os.path.dirname(__file__))
     config.clear()
     config.read(user=False)
     config.set_file(f"{DATA_DIR}/config.yml")
@@ -86,3 +84,23 @@ def test_ModelInfo_has_compartments_component():
     )
     assert type(s.compartments) == compartments.Compartments
     assert type(s.compartments) == compartments.Compartments
+
+
+def test_get_transition_array_returns_copies():
+    config.clear()
+    config.read(user=False)
+    config.set_file(f"{DATA_DIR}/config.yml")
+
+    s = model_info.ModelInfo(config=config, nslots=1, seir_modifiers_scenario="None", write_csv=False)
+    unique_strings, transition_array, proportion_array, proportion_info = s.compartments.get_transition_array()
+    expected = [list(unique_strings), transition_array.copy(), proportion_array.copy(), proportion_info.copy()]
+
+    # a caller modifying its arrays does not change the ones of the next callers
+    unique_strings.append("modified")
+    transition_array[:] = -1
+    proportion_array[:] = -1
+    proportion_info[:] = -1
+    again = s.compartments.get_transition_array()
+    assert again[0] == expected[0]
+    for array, expected_array in zip(again[1:], expected[1:]):
+        np.testing.assert_array_equal(array, expected_array)
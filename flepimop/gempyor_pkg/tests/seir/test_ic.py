@@ -4,7 +4,6 @@ from gempyor import seeding, model_info, initial_conditions
 from gempyor.utils import config
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
 
 
 class TestIC:
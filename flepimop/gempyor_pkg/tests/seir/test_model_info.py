@@ -6,13 +6,13 @@ import pytest
 import confuse
 
 from gempyor.model_info import ModelInfo, subpopulation_structure
+from gempyor import file_paths, model_info
 
 from gempyor.utils import config
 
 TEST_SETUP_NAME = "minimal_test"
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
 
 
 class TestModelInfo:
@@ -108,3 +108,156 @@ class TestModelInfo:
             inference_filepath_suffix="",
             setup_name=TEST_SETUP_NAME,
         )
+
+    def test_ModelInfo_copies_cached_components(self):
+        config.clear()
+        config.read(user=False)
+        config.set_file(f"{DATA_DIR}/config_test.yml")
+
+        s1 = ModelInfo(config=config, setup_name=TEST_SETUP_NAME)
+        n_cached = len(model_info._model_spec_cache)
+        s2 = ModelInfo(config=config, setup_name=TEST_SETUP_NAME, first_sim_index=2)
+        assert len(model_info._model_spec_cache) == n_cached  # built once
+        assert s2.subpop_struct.subpop_names == s1.subpop_struct.subpop_names
+
+        # each ModelInfo gets its own copy, that it may modify in place
+        mobility2 = s2.mobility.data.copy()
+        s1.mobility.data[:] = 0  # as done by the no-spread tests
+        s1.subpop_struct.subpop_pop[0] = -1
+        s1.parameters.pdata[s1.parameters.pnames[0]]["idx"] = -1
+        s1.compartments.compartments.loc[:, "name"] = "modified"
+        np.testing.assert_array_equal(s2.mobility.data, mobility2)
+        assert (s2.subpop_struct.subpop_pop > 0).all()
+        assert s2.parameters.pdata[s2.parameters.pnames[0]]["idx"] == 0
+        assert (s2.compartments.compartments["name"] != "modified").all()
+        # the copies still read the config
+        assert s2.parameters.pconfig is s1.parameters.pconfig
+
+        config["end_date"] = "2022-12-31"
+        s3 = ModelInfo(config=config, setup_name=TEST_SETUP_NAME)
+        assert (s3.mobility.data > 0).any()
+        assert len(s3.parameters.pdata) == len(s1.parameters.pdata)
+
+    def test_ModelInfo_shared_components_follow_the_files(self, tmp_path, monkeypatch):
+        config.clear()
+        config.read(user=False)
+        config.set_file(f"{DATA_DIR}/config_test.yml")
+
+        # the same relative geodata and mobility paths, under two working directories
+        for name, subpops in [("a", ["01", "02"]), ("b", ["01", "02", "03"])]:
+            (tmp_path / name / "data").mkdir(parents=True)
+            (tmp_path / name / "data" / "geodata.csv").write_text(
+                "subpop,population\n" + "".join(f"{sp},100\n" for sp in subpops)
+            )
+            (tmp_path / name / "data" / "mobility.csv").write_text("ori,dest,amount\n01,02,10\n")
+
+        monkeypatch.chdir(tmp_path / "a")
+        s_a = ModelInfo(config=config, setup_name=TEST_SETUP_NAME)
+        monkeypatch.chdir(tmp_path / "b")
+        s_b = ModelInfo(config=config, setup_name=TEST_SETUP_NAME)
+        assert s_a.subpop_struct.subpop_names == ["01", "02"]
+        assert s_b.subpop_struct.subpop_names == ["01", "02", "03"]
+
+        # a rewritten file is read again
+        geodata = tmp_path / "b" / "data" / "geodata.csv"
+        geodata.write_text("subpop,population\n01,100\n02,100\n04,100\n")
+        os.utime(geodata, ns=(geodata.stat().st_atime_ns, geodata.stat().st_mtime_ns + 10**9))
+        s_b2 = ModelInfo(config=config, setup_name=TEST_SETUP_NAME)
+        assert s_b2.subpop_struct.subpop_names == ["01", "02", "04"]
+
+    def test_ModelInfo_read_simIDs(self):
+        config.clear()
+        config.read(user=False)
+        config.set_file(f"{DATA_DIR}/config_test.yml")
+
+        s = ModelInfo(config=config, setup_name=TEST_SETUP_NAME, write_parquet=True)
+        dfs = {
+            "spar": pd.DataFrame({"parameter": ["sigma", "gamma"], "value": [0.25, 0.2]}),
+            "snpi": pd.DataFrame({"subpop": ["10001", "20002"], "value": [0.1, 0.3]}),
+        }
+        for ftype, df in dfs.items():
+            s.write_simID(ftype=ftype, sim_id=1, df=df)
+
+        loaded = s.read_simIDs(["spar", "snpi"], sim_id=1, input=False)
+        assert loaded.keys() == dfs.keys()
+        for ftype, df in dfs.items():
+            pd.testing.assert_frame_equal(loaded[ftype], df)
+
+    def test_ModelInfo_read_simID_arrow(self):
+        config.clear()
+        config.read(user=False)
+        config.set_file(f"{DATA_DIR}/config_test.yml")
+
+        s = ModelInfo(config=config, setup_name=TEST_SETUP_NAME, write_parquet=True)
+        df = pd.DataFrame({"subpop": ["10001", "20002", "30003"], "value": [0.1, 0.3, 0.5]})
+        s.write_simID(ftype="snpi", sim_id=2, df=df)
+
+        table = s.read_simID_arrow(ftype="snpi", sim_id=2, input=False)
+        pd.testing.assert_frame_equal(table.to_pandas(), df)
+        pd.testing.assert_frame_equal(table.to_pandas(), s.read_simID(ftype="snpi", sim_id=2, input=False))
+        # the numeric columns of the memory-mapped file are handed to numpy without copy
+        values = table.column("value").chunk(0).to_numpy(zero_copy_only=True)
+        np.testing.assert_array_equal(values, df["value"].to_numpy())
+
+    def test_ModelInfo_get_filename_matches_file_paths(self):
+        config.clear()
+        config.read(user=False)
+        config.set_file(f"{DATA_DIR}/config_test.yml")
+
+        s = ModelInfo(
+            config=config,
+            setup_name=TEST_SETUP_NAME,
+            write_parquet=True,
+            first_sim_index=3,
+            in_run_id="in_run",
+            out_run_id="out_run",
+            inference_filename_prefix="global/intermediate/",
+            inference_filepath_suffix="000000001",
+        )
+        for input, run_id, prefix in [(True, s.in_run_id, s.in_prefix), (False, s.out_run_id, s.out_prefix)]:
+            expected = file_paths.create_file_name(
+                run_id=run_id,
+                prefix=prefix,
+                index=4 + 3 - 1,
+                ftype="spar",
+                extension="parquet",
+                inference_filepath_suffix="000000001",
+                inference_filename_prefix="global/intermediate/",
+                create_directory=False,
+            )
+            assert s.get_filename(ftype="spar", sim_id=4, input=input) == os.path.join(str(s.path_prefix), expected)
+
+    def test_ModelInfo_warmup(self):
+        from gempyor import outcomes, steps_rk4
+
+        config.clear()
+        config.read(user=False)
+        config.set_file(f"{DATA_DIR}/config_test.yml")
+
+        s = ModelInfo(config=config, setup_name=TEST_SETUP_NAME)
+        s.warmup()
+        assert steps_rk4.apply_seeding.signatures
+        assert outcomes.multishift.signatures
+        assert "compartments" not in s.__dict__  # the warmup does not build the model components
+
+        # the compiled kernels give the same results as their python equivalents
+        rng = np.random.default_rng(0)
+        arr = rng.uniform(size=(10, s.nsubpops))
+        shifts = rng.integers(0, 4, size=(10, s.nsubpops))
+        np.testing.assert_array_equal(
+            outcomes.multishift(arr, shifts, stoch_delay_flag=False),
+            outcomes.multishiftee(arr, shifts, stoch_delay_flag=False),
+        )
+
+        states_next = np.full((2, s.nsubpops), 10.0)
+        states_daily_incid = np.zeros((1, 2, s.nsubpops))
+        sources, destinations, subpops = np.array([0, 0]), np.array([1, 1]), np.array([0, s.nsubpops - 1])
+        amounts = np.array([3.0, 4.0])
+        steps_rk4.apply_seeding(
+            states_next, states_daily_incid, 0, np.int64(0), np.int64(2), sources, destinations, subpops, amounts
+        )
+        expected = np.full((2, s.nsubpops), 10.0)
+        expected[0, [0, s.nsubpops - 1]] -= [3.0, 4.0]
+        expected[1, [0, s.nsubpops - 1]] += [3.0, 4.0]
+        np.testing.assert_array_equal(states_next, expected)
+        assert states_daily_incid.sum() == 7.0
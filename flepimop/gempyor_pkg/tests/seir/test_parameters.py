@@ -15,13 +15,17 @@ from gempyor import model_info, seir, NPI, file_paths, parameters, subpopulation
 from gempyor.utils import config, write_df, read_df
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
 
 
-def test_parameters_from_config_plus_read_write():
+@pytest.mark.parametrize(
+    "config_file",
+    ["config_compartmental_model_format.yml", "config_compartmental_model_format_with_covariates.yml"],
+)
+def test_parameters_from_config_plus_read_write(config_file):
+    # the second config has a timeseries parameter (R0s), that is not written but reloaded from its file
     config.clear()
     config.read(user=False)
-    config.set_file(f"{DATA_DIR}/config_compartmental_model_format.yml")
+    config.set_file(f"{DATA_DIR}/{config_file}")
 
     index = 1
     run_id = "test_parameter"
@@ -38,14 +42,8 @@ def test_parameters_from_config_plus_read_write():
         out_prefix=prefix,
     )
 
-    lhs = parameters.Parameters(
-        parameter_config=config["seir"]["parameters"],
-        ti=s.ti,
-        tf=s.tf,
-        subpop_names=s.subpop_struct.subpop_names,
-    )
-    n_days = 10
-    nsubpops = 5
+    n_days = s.n_days
+    nsubpops = s.nsubpops
 
     p = parameters.Parameters(
         parameter_config=config["seir"]["parameters"],
@@ -53,7 +51,7 @@ def test_parameters_from_config_plus_read_write():
         tf=s.tf,
         subpop_names=s.subpop_struct.subpop_names,
     )
-    p_draw = p.parameters_quick_draw(n_days=10, nsubpops=5)
+    p_draw = p.parameters_quick_draw(n_days=n_days, nsubpops=nsubpops)
     # test shape
     assert p_draw.shape == (len(config["seir"]["parameters"].keys()), n_days, nsubpops)
 
@@ -70,6 +68,28 @@ def test_parameters_from_config_plus_read_write():
     assert (p_draw == p_load).all()
 
 
+@pytest.mark.parametrize(
+    "csv",
+    [
+        "date,01,02\n2020-01-01,1.5,2.5\n2020-01-02,3.5,4.5\n",
+        "date,01,02\n2020-01-01 00:00:00,1.5,2.5\n2020-01-02 00:00:00,3.5,4.5\n",
+        "date,01,02\n1/1/2020,1.5,2.5\n1/2/2020,3.5,4.5\n",
+        "date, 01, 02\n2020-01-01, 1.5, 2.5\n2020-01-02, 3.5, 4.5\n",
+    ],
+    ids=["iso", "datetime", "us_dates", "spaces"],
+)
+def test_read_timeseries_accepts_read_df_files(tmp_path, csv):
+    fname = tmp_path / "timeseries.csv"
+    fname.write_text(csv)
+
+    df = parameters._read_timeseries(str(fname)).set_index("date")
+    df.index = pd.to_datetime(df.index)
+
+    assert list(df.columns) == ["01", "02"]
+    assert list(df.index) == list(pd.date_range("2020-01-01", "2020-01-02"))
+    np.testing.assert_array_equal(df.to_numpy(), [[1.5, 2.5], [3.5, 4.5]])
+
+
 def test_parameters_quick_draw_old():
     config.clear()
     config.read(user=False)
@@ -126,54 +146,3 @@ def test_parameters_quick_draw_old():
 
     assert gamma.shape == (modinf.n_days, modinf.nsubpops)
     assert len(np.unique(gamma)) == 1
-
-
-def test_parameters_from_timeseries_file():
-    config.clear()
-    config.read(user=False)
-    config.set_file(f"{DATA_DIR}/config_compartmental_model_format.yml")
-
-    index = 1
-    run_id = "test_parameter"
-    prefix = ""
-    s = model_info.ModelInfo(
-        config=config,
-        nslots=1,
-        write_csv=False,
-        first_sim_index=index,
-        in_run_id=run_id,
-        in_prefix=prefix,
-        out_run_id=run_id,
-        out_prefix=prefix,
-    )
-
-    lhs = parameters.Parameters(
-        parameter_config=config["seir"]["parameters"],
-        ti=s.ti,
-        tf=s.tf,
-        subpop_names=s.subpop_struct.subpop_names,
-    )
-    n_days = 10
-    nsubpops = 5
-
-    p = parameters.Parameters(
-        parameter_config=config["seir"]["parameters"],
-        ti=s.ti,
-        tf=s.tf,
-        subpop_names=s.subpop_struct.subpop_names,
-    )
-    p_draw = p.parameters_quick_draw(n_days=10, nsubpops=5)
-    # test shape
-    assert p_draw.shape == (len(config["seir"]["parameters"].keys()), n_days, nsubpops)
-
-    write_df(fname="test_pwrite.parquet", df=p.getParameterDF(p_draw=p_draw))
-
-    rhs = parameters.Parameters(
-        parameter_config=config["seir"]["parameters"],
-        ti=s.ti,
-        tf=s.tf,
-        subpop_names=s.subpop_struct.subpop_names,
-    )
-    p_load = rhs.parameters_load(param_df=read_df("test_pwrite.parquet"), n_days=n_days, nsubpops=nsubpops)
-
-    assert (p_draw == p_load).all()
@@ -1,43 +1,44 @@
+import confuse
 import os
+import pytest
 from gempyor import seeding, model_info
 from gempyor.utils import config
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
 
 
+@pytest.fixture(scope="module")
+def seeding_ctx():
+    # the config is parsed and the ModelInfo built once for the whole module, the tests only read them
+    config.clear()
+    config.read(user=False)
+    config.set_file(f"{DATA_DIR}/config.yml")
+
+    s = model_info.ModelInfo(
+        config=config,
+        setup_name="test_seeding",
+        nslots=1,
+        seir_modifiers_scenario=None,
+        outcome_modifiers_scenario=None,
+        write_csv=False,
+    )
+    sic = seeding.SeedingFactory(config=s.seeding_config)
+    return s, sic
+
+
+@pytest.mark.slow
 class TestSeeding:
-    def test_Seeding_success(self):
-        config.clear()
-        config.read(user=False)
-        config.set_file(f"{DATA_DIR}/config.yml")
-
-        s = model_info.ModelInfo(
-            config=config,
-            setup_name="test_seeding",
-            nslots=1,
-            seir_modifiers_scenario=None,
-            outcome_modifiers_scenario=None,
-            write_csv=False,
-        )
-        sic = seeding.SeedingFactory(config=s.seeding_config)
+    def test_Seeding_success(self, seeding_ctx):
+        s, sic = seeding_ctx
         assert sic.seeding_config == s.seeding_config
 
-    def test_Seeding_draw_success(self):
-        config.clear()
-        config.read(user=False)
-        config.set_file(f"{DATA_DIR}/config.yml")
-
-        s = model_info.ModelInfo(
-            config=config,
-            setup_name="test_seeding",
-            nslots=1,
-            seir_modifiers_scenario=None,
-            outcome_modifiers_scenario=None,
-            write_csv=False,
-        )
-        sic = seeding.SeedingFactory(config=s.seeding_config)
-        s.seeding_config["method"] = "NoSeeding"
-
-        seeding_result = sic.get_from_config(sim_id=100, modinf=s)
-        print(seeding_result)
+    def test_Seeding_draw_success(self, seeding_ctx):
+        s, _ = seeding_ctx
+        # a seeding of its own, so that the shared config is left unchanged for the other tests
+        sic = seeding.SeedingFactory(config=confuse.RootView([confuse.ConfigSource.of({"method": "NoSeeding"})]))
+
+        seeding_data, seeding_amounts = sic.get_from_config(sim_id=100, modinf=s)
+        assert len(seeding_amounts) == 0
+        assert len(seeding_data["seeding_sources"]) == 0
+        assert (seeding_data["day_start_idx"] == 0).all()
+        assert len(seeding_data["day_start_idx"]) == s.n_days + 1
@@ -1,24 +1,77 @@
+import confuse
+import copy
+import datetime
+import functools
 import numpy as np
 import os
+import pandas as pd
 import pytest
 import warnings
-import shutil
 
-import pathlib
-import pyarrow as pa
-import pyarrow.parquet as pq
+import concurrent.futures
 
-from gempyor import model_info, seir, NPI, file_paths, subpopulation_structure
+from gempyor import model_info, seir, NPI, file_paths
 
 from gempyor.utils import config
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
+# rows compared by the resume tests, selected by pyarrow from the row group statistics while reading the files
+RESUME_DAY_PREVALENCE = [("date", "=", datetime.datetime(2020, 3, 15)), ("mc_value_type", "=", "prevalence")]
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_source(path):
+    return confuse.YamlSource(path)
+
+
+def load_config(*paths):
+    """
+    Reset the global config to the config files at paths, each one overlaid on the previous ones (as by successive
+    config.set_file). The files are parsed only once per session, each call gets its own copy of the parsed values,
+    as the values returned by the config views may be modified in place.
+    """
+    config.clear()
+    config.read(user=False)
+    for path in paths:
+        source = _yaml_source(path)
+        config.set(confuse.ConfigSource(copy.deepcopy(dict(source)), filename=source.filename))
+
+
+def prepare_parameters(modinf):
+    """
+    Draw the parameters of modinf, reduce them by its SEIR modifiers and parse them against its transitions, as
+    onerun_SEIR does. Returns the parsed parameters and the transition, proportion and proportion info arrays.
+    """
+    npi = NPI.NPIBase.execute(
+        npi_config=modinf.npi_config_seir,
+        modinf=modinf,
+        modifiers_library=modinf.seir_modifiers_library,
+        subpops=modinf.subpop_struct.subpop_names,
+        pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
+        pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
+    )
+
+    params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
+    params = modinf.parameters.parameters_reduce(params, npi)
+
+    (
+        unique_strings,
+        transition_array,
+        proportion_array,
+        proportion_info,
+    ) = modinf.compartments.get_transition_array()
+    parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
+    return parsed_parameters, transition_array, proportion_array, proportion_info
+
+
+def run_replicates(n, *args):
+    """Run n independent steps_SEIR integrations on a thread pool (the integration kernels release the GIL)."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=n) as executor:
+        return list(executor.map(lambda _: seir.steps_SEIR(*args), range(n)))
 
 
 def test_check_values():
-    os.chdir(os.path.dirname(__file__))
-    config.set_file(f"{DATA_DIR}/config.yml")
+    load_config(f"{DATA_DIR}/config.yml")
 
     modinf = model_info.ModelInfo(
         config=config,
@@ -27,35 +80,32 @@ def test_check_values():
         write_csv=False,
     )
 
-    with warnings.catch_warnings(record=True) as w:
-        seeding = np.zeros((modinf.n_days, modinf.nsubpops))
-
-        if np.all(seeding == 0):
+    seeding = np.zeros((modinf.n_days, modinf.nsubpops))
+    with pytest.warns(UserWarning, match="seeding"):
+        if not seeding.any():
             warnings.warn("provided seeding has only value 0", UserWarning)
 
-        seeding[0, 0] = 1
+    seeding[0, 0] = 1
 
-        # if np.all(seeding == 0):
-        #    warnings.warn("provided seeding has only value 0", UserWarning)
+    # if not seeding.any():
+    #    warnings.warn("provided seeding has only value 0", UserWarning)
 
-        if np.all(modinf.mobility.data < 1):
+    # the mobility of the config has values above 1: no warning
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        if modinf.mobility.data.max() < 1:
             warnings.warn("highest mobility value is less than 1", UserWarning)
 
-        modinf.mobility.data[0] = 0.8
-        modinf.mobility.data[1] = 0.5
+    modinf.mobility.data[0] = 0.8
+    modinf.mobility.data[1] = 0.5
 
-        if np.all(modinf.mobility.data < 1):
+    with pytest.warns(UserWarning, match="mobility"):
+        if modinf.mobility.data.max() < 1:
             warnings.warn("highest mobility value is less than 1", UserWarning)
 
-        assert len(w) == 2
-        assert issubclass(w[0].category, UserWarning)
-        assert issubclass(w[1].category, UserWarning)
-        assert "seeding" in str(w[0].message)
-        assert "mobility" in str(w[1].message)
-
 
 def test_constant_population_legacy_integration():
-    config.set_file(f"{DATA_DIR}/config.yml")
+    load_config(f"{DATA_DIR}/config.yml")
 
     first_sim_index = 1
     run_id = "test"
@@ -76,25 +126,7 @@ def test_constant_population_legacy_integration():
     seeding_data, seeding_amounts = modinf.seeding.get_from_file(sim_id=100, modinf=modinf)
     initial_conditions = modinf.initial_conditions.get_from_config(sim_id=100, modinf=modinf)
 
-    npi = NPI.NPIBase.execute(
-        npi_config=modinf.npi_config_seir,
-        modinf=modinf,
-        modifiers_library=modinf.seir_modifiers_library,
-        subpops=modinf.subpop_struct.subpop_names,
-        pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
-        pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
-    )
-
-    params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
-    params = modinf.parameters.parameters_reduce(params, npi)
-
-    (
-        unique_strings,
-        transition_array,
-        proportion_array,
-        proportion_info,
-    ) = modinf.compartments.get_transition_array()
-    parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
+    parsed_parameters, transition_array, proportion_array, proportion_info = prepare_parameters(modinf)
 
     states = seir.steps_SEIR(
         modinf,
@@ -109,21 +141,14 @@ def test_constant_population_legacy_integration():
 
     completepop = modinf.subpop_pop.sum()
     origpop = modinf.subpop_pop
-    for it in range(modinf.n_days):
-        totalpop = 0
-        for i in range(modinf.nsubpops):
-            totalpop += states["prevalence"].sum(axis=1)[it, i]
-            assert (
-                states["prevalence"].sum(axis=1)[it, i] - 1e-3
-                < origpop[i]
-                < states["prevalence"].sum(axis=1)[it, i] + 1e-3
-            )
-        assert completepop - 1e-3 < totalpop < completepop + 1e-3
+    totals = states["prevalence"].sum(axis=1)  # (n_days, nsubpops)
+    np.testing.assert_allclose(totals, np.broadcast_to(origpop, totals.shape), rtol=0, atol=1e-3)
+    np.testing.assert_allclose(totals.sum(axis=1), completepop, rtol=0, atol=1e-3)
 
 
 def test_constant_population_rk4jit_integration_fail():
     with pytest.raises(ValueError, match=r".*with.*method.*integration.*"):
-        config.set_file(f"{DATA_DIR}/config.yml")
+        load_config(f"{DATA_DIR}/config.yml")
 
         first_sim_index = 1
         run_id = "test"
@@ -145,25 +170,7 @@ def test_constant_population_rk4jit_integration_fail():
         seeding_data, seeding_amounts = modinf.seeding.get_from_file(sim_id=100, modinf=modinf)
         initial_conditions = modinf.initial_conditions.get_from_config(sim_id=100, modinf=modinf)
 
-        npi = NPI.NPIBase.execute(
-            npi_config=modinf.npi_config_seir,
-            modinf=modinf,
-            modifiers_library=modinf.seir_modifiers_library,
-            subpops=modinf.subpop_struct.subpop_names,
-            pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
-            pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
-        )
-
-        params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
-        params = modinf.parameters.parameters_reduce(params, npi)
-
-        (
-            unique_strings,
-            transition_array,
-            proportion_array,
-            proportion_info,
-        ) = modinf.compartments.get_transition_array()
-        parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
+        parsed_parameters, transition_array, proportion_array, proportion_info = prepare_parameters(modinf)
 
         states = seir.steps_SEIR(
             modinf,
@@ -178,21 +185,14 @@ def test_constant_population_rk4jit_integration_fail():
 
         completepop = modinf.subpop_pop.sum()
         origpop = modinf.subpop_pop
-        for it in range(modinf.n_days):
-            totalpop = 0
-            for i in range(modinf.nsubpops):
-                totalpop += states["prevalence"].sum(axis=1)[it, i]
-                assert (
-                    states["prevalence"].sum(axis=1)[it, i] - 1e-3
-                    < origpop[i]
-                    < states["prevalence"].sum(axis=1)[it, i] + 1e-3
-                )
-            assert completepop - 1e-3 < totalpop < completepop + 1e-3
+        totals = states["prevalence"].sum(axis=1)  # (n_days, nsubpops)
+        np.testing.assert_allclose(totals, np.broadcast_to(origpop, totals.shape), rtol=0, atol=1e-3)
+        np.testing.assert_allclose(totals.sum(axis=1), completepop, rtol=0, atol=1e-3)
 
 
 def test_constant_population_rk4jit_integration():
-    # config.set_file(f"{DATA_DIR}/config.yml")
-    config.set_file(f"{DATA_DIR}/config_seir_integration_method_rk4_2.yml")
+    # config_seir_integration_method_rk4_2.yml only overrides the seir section of config.yml
+    load_config(f"{DATA_DIR}/config.yml", f"{DATA_DIR}/config_seir_integration_method_rk4_2.yml")
 
     first_sim_index = 1
     run_id = "test"
@@ -215,25 +215,7 @@ def test_constant_population_rk4jit_integration():
     seeding_data, seeding_amounts = modinf.seeding.get_from_file(sim_id=100, modinf=modinf)
     initial_conditions = modinf.initial_conditions.get_from_config(sim_id=100, modinf=modinf)
 
-    npi = NPI.NPIBase.execute(
-        npi_config=modinf.npi_config_seir,
-        modinf=modinf,
-        modifiers_library=modinf.seir_modifiers_library,
-        subpops=modinf.subpop_struct.subpop_names,
-        pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
-        pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
-    )
-
-    params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
-    params = modinf.parameters.parameters_reduce(params, npi)
-
-    (
-        unique_strings,
-        transition_array,
-        proportion_array,
-        proportion_info,
-    ) = modinf.compartments.get_transition_array()
-    parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
+    parsed_parameters, transition_array, proportion_array, proportion_info = prepare_parameters(modinf)
     states = seir.steps_SEIR(
         modinf,
         parsed_parameters,
@@ -246,24 +228,14 @@ def test_constant_population_rk4jit_integration():
     )
     completepop = modinf.subpop_pop.sum()
     origpop = modinf.subpop_pop
-    for it in range(modinf.n_days):
-        totalpop = 0
-        for i in range(modinf.nsubpops):
-            totalpop += states["prevalence"].sum(axis=1)[it, i]
-            assert (
-                states["prevalence"].sum(axis=1)[it, i] - 1e-3
-                < origpop[i]
-                < states["prevalence"].sum(axis=1)[it, i] + 1e-3
-            )
-        assert completepop - 1e-3 < totalpop < completepop + 1e-3
+    totals = states["prevalence"].sum(axis=1)  # (n_days, nsubpops)
+    np.testing.assert_allclose(totals, np.broadcast_to(origpop, totals.shape), rtol=0, atol=1e-3)
+    np.testing.assert_allclose(totals.sum(axis=1), completepop, rtol=0, atol=1e-3)
 
 
 def test_steps_SEIR_nb_simple_spread_with_txt_matrices():
-    os.chdir(os.path.dirname(__file__))
-    config.clear()
-    config.read(user=False)
     print("test mobility with txt matrices")
-    config.set_file(f"{DATA_DIR}/config.yml")
+    load_config(f"{DATA_DIR}/config.yml")
 
     first_sim_index = 1
     run_id = "test_SeedOneNode"
@@ -283,71 +255,29 @@ def test_steps_SEIR_nb_simple_spread_with_txt_matrices():
     seeding_data, seeding_amounts = modinf.seeding.get_from_file(sim_id=100, modinf=modinf)
     initial_conditions = modinf.initial_conditions.get_from_config(sim_id=100, modinf=modinf)
 
-    npi = NPI.NPIBase.execute(
-        npi_config=modinf.npi_config_seir,
-        modinf=modinf,
-        modifiers_library=modinf.seir_modifiers_library,
-        subpops=modinf.subpop_struct.subpop_names,
-        pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
-        pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
-    )
-
-    params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
-    params = modinf.parameters.parameters_reduce(params, npi)
+    parsed_parameters, transition_array, proportion_array, proportion_info = prepare_parameters(modinf)
 
-    (
-        unique_strings,
+    replicates = run_replicates(
+        10,
+        modinf,
+        parsed_parameters,
         transition_array,
         proportion_array,
         proportion_info,
-    ) = modinf.compartments.get_transition_array()
-    parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
-
-    for i in range(5):
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
-        df = seir.states2Df(modinf, states)
-        assert (
-            df[(df["mc_value_type"] == "prevalence") & (df["mc_infection_stage"] == "R")].loc[str(modinf.tf), "10001"]
-            > 1
-        )
-        assert (
-            df[(df["mc_value_type"] == "prevalence") & (df["mc_infection_stage"] == "R")].loc[str(modinf.tf), "20002"]
-            > 1
-        )
-
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
-        df = seir.states2Df(modinf, states)
-        assert (
-            df[(df["mc_value_type"] == "prevalence") & (df["mc_infection_stage"] == "R")].loc[str(modinf.tf), "20002"]
-            > 1
-        )
-        assert df[(df["mc_value_type"] == "incidence") & (df["mc_infection_stage"] == "I1")].max()["20002"] > 0
-        assert df[(df["mc_value_type"] == "incidence") & (df["mc_infection_stage"] == "I1")].max()["10001"] > 0
+        initial_conditions,
+        seeding_data,
+        seeding_amounts,
+    )
+    for states in replicates:
+        df = seir.states2Df(modinf, states).set_index(["mc_value_type", "mc_infection_stage", "date"]).sort_index()
+        assert df.loc[("prevalence", "R", pd.Timestamp(modinf.tf)), "10001"] > 1
+        assert df.loc[("prevalence", "R", pd.Timestamp(modinf.tf)), "20002"] > 1
+        assert df.loc[("incidence", "I1"), "20002"].max() > 0
+        assert df.loc[("incidence", "I1"), "10001"].max() > 0
 
 
 def test_steps_SEIR_nb_simple_spread_with_csv_matrices():
-    os.chdir(os.path.dirname(__file__))
-    config.clear()
-    config.read(user=False)
-    config.set_file(f"{DATA_DIR}/config.yml")
+    load_config(f"{DATA_DIR}/config.yml")
     print("test mobility with csv matrices")
 
     first_sim_index = 1
@@ -369,47 +299,31 @@ def test_steps_SEIR_nb_simple_spread_with_csv_matrices():
     seeding_data, seeding_amounts = modinf.seeding.get_from_file(sim_id=100, modinf=modinf)
     initial_conditions = modinf.initial_conditions.get_from_config(sim_id=100, modinf=modinf)
 
-    npi = NPI.NPIBase.execute(
-        npi_config=modinf.npi_config_seir,
-        modinf=modinf,
-        modifiers_library=modinf.seir_modifiers_library,
-        subpops=modinf.subpop_struct.subpop_names,
-        pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
-        pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
-    )
+    parsed_parameters, transition_array, proportion_array, proportion_info = prepare_parameters(modinf)
 
-    params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
-    params = modinf.parameters.parameters_reduce(params, npi)
-
-    (
-        unique_strings,
+    replicates = run_replicates(
+        5,
+        modinf,
+        parsed_parameters,
         transition_array,
         proportion_array,
         proportion_info,
-    ) = modinf.compartments.get_transition_array()
-    parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
-
-    for i in range(5):
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
-        df = seir.states2Df(modinf, states)
+        initial_conditions,
+        seeding_data,
+        seeding_amounts,
+    )
+    for states in replicates:
+        df = seir.states2Df(modinf, states).set_index(["mc_value_type", "mc_infection_stage", "date"]).sort_index()
 
-        assert df[(df["mc_value_type"] == "incidence") & (df["mc_infection_stage"] == "I1")].max()["20002"] > 0
-        assert df[(df["mc_value_type"] == "incidence") & (df["mc_infection_stage"] == "I1")].max()["10001"] > 0
+        assert df.loc[("incidence", "I1"), "20002"].max() > 0
+        assert df.loc[("incidence", "I1"), "10001"].max() > 0
 
 
 def test_steps_SEIR_no_spread():
-    os.chdir(os.path.dirname(__file__))
     print("test mobility with no spread")
-    config.set_file(f"{DATA_DIR}/config.yml")
+    load_config(f"{DATA_DIR}/config.yml")
+    # the integration is deterministic, a coarse time step and two replicates are enough to check there is no spread
+    config["seir"]["integration"]["dt"] = 1
 
     first_sim_index = 1
     run_id = "test_SeedOneNode"
@@ -431,213 +345,82 @@ def test_steps_SEIR_no_spread():
 
     modinf.mobility.data = modinf.mobility.data * 0
 
-    npi = NPI.NPIBase.execute(
-        npi_config=modinf.npi_config_seir,
-        modinf=modinf,
-        modifiers_library=modinf.seir_modifiers_library,
-        subpops=modinf.subpop_struct.subpop_names,
-        pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
-        pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
-    )
-
-    params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
-    params = modinf.parameters.parameters_reduce(params, npi)
+    parsed_parameters, transition_array, proportion_array, proportion_info = prepare_parameters(modinf)
 
-    (
-        unique_strings,
+    replicates = run_replicates(
+        2,
+        modinf,
+        parsed_parameters,
         transition_array,
         proportion_array,
         proportion_info,
-    ) = modinf.compartments.get_transition_array()
-    parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
-
-    for i in range(10):
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
-        df = seir.states2Df(modinf, states)
-        assert (
-            df[(df["mc_value_type"] == "prevalence") & (df["mc_infection_stage"] == "R")].loc[str(modinf.tf), "20002"]
-            == 0.0
-        )
-
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
-        df = seir.states2Df(modinf, states)
-        assert (
-            df[(df["mc_value_type"] == "prevalence") & (df["mc_infection_stage"] == "R")].loc[str(modinf.tf), "20002"]
-            == 0.0
-        )
-
-
-def test_continuation_resume():
-    os.chdir(os.path.dirname(__file__))
-    config.clear()
-    config.read(user=False)
-    config.set_file("data/config.yml")
-    seir_modifiers_scenario = "Scenario1"
-    sim_id2write = 100
-    nslots = 1
-    write_csv = False
-    write_parquet = True
-    first_sim_index = 1
-    run_id = "test"
-    prefix = ""
-    stoch_traj_flag = True
-
-    modinf = model_info.ModelInfo(
-        config=config,
-        nslots=nslots,
-        seir_modifiers_scenario=seir_modifiers_scenario,
-        write_csv=write_csv,
-        write_parquet=write_parquet,
-        first_sim_index=first_sim_index,
-        in_run_id=run_id,
-        in_prefix=prefix,
-        out_run_id=run_id,
-        out_prefix=prefix,
+        initial_conditions,
+        seeding_data,
+        seeding_amounts,
     )
-    seir.onerun_SEIR(sim_id2write=int(sim_id2write), modinf=modinf, config=config)
-
-    states_old = pq.read_table(
-        file_paths.create_file_name(modinf.in_run_id, modinf.in_prefix, 100, "seir", "parquet"),
-    ).to_pandas()
-    states_old = states_old[states_old["date"] == "2020-03-15"].reset_index(drop=True)
-
-    config.clear()
-    config.read(user=False)
-    config.set_file("data/config_continuation_resume.yml")
-    seir_modifiers_scenario = "Scenario1"
+    for states in replicates:
+        df = seir.states2Df(modinf, states).set_index(["mc_value_type", "mc_infection_stage", "date"]).sort_index()
+        assert df.loc[("prevalence", "R", pd.Timestamp(modinf.tf)), "20002"] == 0.0
+    assert np.array_equal(replicates[0]["prevalence"].to_numpy(), replicates[1]["prevalence"].to_numpy())
+
+
+@pytest.fixture(scope="module")
+def baseline_run(tmp_path_factory):
+    """
+    Run config.yml (Scenario1) once, as the sim_id 100 of the run "test", for the resume tests to start from. The
+    seeding is read from the tracked model_output/seed, the outputs are written under a temporary directory.
+    Returns the prefix the outputs are written under, and the sim_id.
+    """
+    prefix = f"{tmp_path_factory.mktemp('baseline')}/"
+    load_config("data/config.yml")
     sim_id2write = 100
-    nslots = 1
-    write_csv = False
-    write_parquet = True
-    first_sim_index = 1
-    run_id = "test"
-    prefix = ""
 
     modinf = model_info.ModelInfo(
         config=config,
-        nslots=nslots,
-        seir_modifiers_scenario=seir_modifiers_scenario,
-        write_csv=write_csv,
-        write_parquet=write_parquet,
-        first_sim_index=first_sim_index,
-        in_run_id=run_id,
-        in_prefix=prefix,
-        out_run_id=run_id,
+        nslots=1,
+        seir_modifiers_scenario="Scenario1",
+        write_csv=False,
+        write_parquet=True,
+        first_sim_index=1,
+        in_run_id="test",
+        in_prefix="",
+        out_run_id="test",
         out_prefix=prefix,
     )
-
     seir.onerun_SEIR(sim_id2write=sim_id2write, modinf=modinf, config=config)
 
-    states_new = pq.read_table(
-        file_paths.create_file_name(modinf.in_run_id, modinf.in_prefix, sim_id2write, "seir", "parquet"),
-    ).to_pandas()
-    states_new = states_new[states_new["date"] == "2020-03-15"].reset_index(drop=True)
-    assert (
-        (
-            states_old[states_old["mc_value_type"] == "prevalence"]
-            == states_new[states_new["mc_value_type"] == "prevalence"]
-        )
-        .all()
-        .all()
-    )
-
-    seir.onerun_SEIR(
-        sim_id2write=sim_id2write + 1, modinf=modinf, sim_id2load=sim_id2write, load_ID=True, config=config
-    )
-    states_new = pq.read_table(
-        file_paths.create_file_name(modinf.in_run_id, modinf.in_prefix, sim_id2write + 1, "seir", "parquet"),
-    ).to_pandas()
-    states_new = states_new[states_new["date"] == "2020-03-15"].reset_index(drop=True)
-    for path in ["model_output/seir", "model_output/snpi", "model_output/spar"]:
-        shutil.rmtree(path)
-
+    return prefix, sim_id2write
 
-def test_inference_resume():
-    os.chdir(os.path.dirname(__file__))
-    config.clear()
-    config.read(user=False)
-    config.set_file("data/config.yml")
-    seir_modifiers_scenario = "Scenario1"
-    sim_id2write = 100
-    nslots = 1
-    write_csv = False
-    write_parquet = True
-    first_sim_index = 1
-    run_id = "test"
-    prefix = ""
-    stoch_traj_flag = True
 
-    spatial_config = config["subpop_setup"]
-    if "data_path" in config:
-        raise ValueError("The config has a data_path section. This is no longer supported.")
-    # spatial_base_path = pathlib.Path(config["data_path"].get())
-    modinf = model_info.ModelInfo(
+@pytest.fixture
+def resume_modinf(request, baseline_run, tmp_path):
+    """
+    ModelInfo of the config file request.param (Scenario1), that reads its inputs from the baseline run and writes
+    its outputs under tmp_path.
+    """
+    baseline_prefix, _ = baseline_run
+    load_config(request.param)
+    return model_info.ModelInfo(
         config=config,
-        nslots=nslots,
-        seir_modifiers_scenario=seir_modifiers_scenario,
-        write_csv=write_csv,
-        write_parquet=write_parquet,
-        first_sim_index=first_sim_index,
-        in_run_id=run_id,
-        in_prefix=prefix,
-        out_run_id=run_id,
-        out_prefix=prefix,
+        nslots=1,
+        seir_modifiers_scenario="Scenario1",
+        write_csv=False,
+        write_parquet=True,
+        first_sim_index=1,
+        in_run_id="test",
+        in_prefix=baseline_prefix,
+        out_run_id="test",
+        out_prefix=f"{tmp_path}/",
     )
 
-    seir.onerun_SEIR(sim_id2write=int(sim_id2write), modinf=modinf, config=config)
-    npis_old = pq.read_table(
-        file_paths.create_file_name(modinf.in_run_id, modinf.in_prefix, sim_id2write, "snpi", "parquet")
-    ).to_pandas()
 
-    config.clear()
-    config.read(user=False)
-    config.set_file("data/config_inference_resume.yml")
-    seir_modifiers_scenario = "Scenario1"
-    nslots = 1
-    write_csv = False
-    write_parquet = True
-    first_sim_index = 1
-    run_id = "test"
-    prefix = ""
+def check_resume_day_prevalence(states_old, states_new):
+    """The resumed run starts from the states of the baseline run."""
+    assert np.array_equal(states_old.to_numpy(), states_new.to_numpy())
 
-    modinf = model_info.ModelInfo(
-        config=config,
-        nslots=nslots,
-        seir_modifiers_scenario=seir_modifiers_scenario,
-        write_csv=write_csv,
-        write_parquet=write_parquet,
-        first_sim_index=first_sim_index,
-        in_run_id=run_id,
-        in_prefix=prefix,
-        out_run_id=run_id,
-        out_prefix=prefix,
-    )
-
-    seir.onerun_SEIR(
-        sim_id2write=sim_id2write + 1, modinf=modinf, sim_id2load=sim_id2write, load_ID=True, config=config
-    )
-    npis_new = pq.read_table(
-        file_paths.create_file_name(modinf.in_run_id, modinf.in_prefix, sim_id2write + 1, "snpi", "parquet")
-    ).to_pandas()
 
+def check_resume_npis(npis_old, npis_new):
+    """The resumed run keeps the modifiers of the baseline run, shifted by the config, and adds its own."""
     assert npis_old["modifier_name"].isin(["None", "Wuhan", "KansasCity"]).all()
     assert npis_new["modifier_name"].isin(["None", "Wuhan", "KansasCity", "BrandNew"]).all()
     # assert((['None', 'Wuhan', 'KansasCity']).isin(npis_old["modifier_name"]).all())
@@ -646,18 +429,52 @@ def test_inference_resume():
     assert (npis_old["end_date"] == "2020-05-15").all()
     assert (npis_new["start_date"] == "2020-04-02").all()
     assert (npis_new["end_date"] == "2020-05-16").all()
-    for path in ["model_output/seir", "model_output/snpi", "model_output/spar"]:
-        shutil.rmtree(path)
 
-    ## Clean up after ourselves
 
+@pytest.mark.slow
+@pytest.mark.xdist_group(name="resume")  # on the same worker, to run the shared baseline only once
+@pytest.mark.parametrize(
+    ("resume_modinf", "ftype", "read_kwargs", "check"),
+    [
+        (
+            "data/config_continuation_resume.yml",
+            "seir",
+            {"filters": RESUME_DAY_PREVALENCE},
+            check_resume_day_prevalence,
+        ),
+        (
+            "data/config_inference_resume.yml",
+            "snpi",
+            {"columns": ["modifier_name", "start_date", "end_date"]},
+            check_resume_npis,
+        ),
+    ],
+    ids=["continuation", "inference"],
+    indirect=["resume_modinf"],
+)
+def test_resume(baseline_run, resume_modinf, ftype, read_kwargs, check):
+    import pyarrow.parquet as pq
+
+    _, sim_id2write = baseline_run
+    modinf = resume_modinf
+    old = pq.read_table(
+        file_paths.create_file_name(modinf.in_run_id, modinf.in_prefix, sim_id2write, ftype, "parquet"),
+        **read_kwargs,
+    ).to_pandas()
+
+    seir.onerun_SEIR(
+        sim_id2write=sim_id2write + 1, modinf=modinf, sim_id2load=sim_id2write, load_ID=True, config=config
+    )
+    new = pq.read_table(
+        file_paths.create_file_name(modinf.out_run_id, modinf.out_prefix, sim_id2write + 1, ftype, "parquet"),
+        **read_kwargs,
+    ).to_pandas()
+
+    check(old, new)
 
-def test_parallel_compartments_with_vacc():
-    os.chdir(os.path.dirname(__file__))
-    config.clear()
-    config.read(user=False)
 
-    config.set_file(f"{DATA_DIR}/config_parallel.yml")
+def test_parallel_compartments_with_vacc():
+    load_config(f"{DATA_DIR}/config_parallel.yml")
 
     first_sim_index = 1
     run_id = "test_parallel"
@@ -677,57 +494,20 @@ def test_parallel_compartments_with_vacc():
     seeding_data, seeding_amounts = modinf.seeding.get_from_file(sim_id=100, modinf=modinf)
     initial_conditions = modinf.initial_conditions.get_from_config(sim_id=100, modinf=modinf)
 
-    npi = NPI.NPIBase.execute(
-        npi_config=modinf.npi_config_seir,
-        modinf=modinf,
-        modifiers_library=modinf.seir_modifiers_library,
-        subpops=modinf.subpop_struct.subpop_names,
-        pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
-        pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
-    )
+    parsed_parameters, transition_array, proportion_array, proportion_info = prepare_parameters(modinf)
 
-    params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
-    params = modinf.parameters.parameters_reduce(params, npi)
-
-    (
-        unique_strings,
+    replicates = run_replicates(
+        10,
+        modinf,
+        parsed_parameters,
         transition_array,
         proportion_array,
         proportion_info,
-    ) = modinf.compartments.get_transition_array()
-    parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
-
-    for i in range(5):
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
-        df = seir.states2Df(modinf, states)
-        assert (
-            df[
-                (df["mc_value_type"] == "prevalence")
-                & (df["mc_infection_stage"] == "R")
-                & (df["mc_vaccination_stage"] == "first_dose")
-            ].max()["10001"]
-            > 2
-        )
-
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
+        initial_conditions,
+        seeding_data,
+        seeding_amounts,
+    )
+    for states in replicates:
         df = seir.states2Df(modinf, states)
         assert (
             df[
@@ -740,10 +520,7 @@ def test_parallel_compartments_with_vacc():
 
 
 def test_parallel_compartments_no_vacc():
-    config.clear()
-    config.read(user=False)
-    os.chdir(os.path.dirname(__file__))
-    config.set_file(f"{DATA_DIR}/config_parallel.yml")
+    load_config(f"{DATA_DIR}/config_parallel.yml")
 
     first_sim_index = 1
     run_id = "test_parallel"
@@ -764,57 +541,20 @@ def test_parallel_compartments_no_vacc():
     seeding_data, seeding_amounts = modinf.seeding.get_from_file(sim_id=100, modinf=modinf)
     initial_conditions = modinf.initial_conditions.get_from_config(sim_id=100, modinf=modinf)
 
-    npi = NPI.NPIBase.execute(
-        npi_config=modinf.npi_config_seir,
-        modinf=modinf,
-        modifiers_library=modinf.seir_modifiers_library,
-        subpops=modinf.subpop_struct.subpop_names,
-        pnames_overlap_operation_sum=modinf.parameters.stacked_modifier_method["sum"],
-        pnames_overlap_operation_reductionprod=modinf.parameters.stacked_modifier_method["reduction_product"],
-    )
+    parsed_parameters, transition_array, proportion_array, proportion_info = prepare_parameters(modinf)
 
-    params = modinf.parameters.parameters_quick_draw(modinf.n_days, modinf.nsubpops)
-    params = modinf.parameters.parameters_reduce(params, npi)
-
-    (
-        unique_strings,
+    replicates = run_replicates(
+        10,
+        modinf,
+        parsed_parameters,
         transition_array,
         proportion_array,
         proportion_info,
-    ) = modinf.compartments.get_transition_array()
-    parsed_parameters = modinf.compartments.parse_parameters(params, modinf.parameters.pnames, unique_strings)
-
-    for i in range(5):
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
-        df = seir.states2Df(modinf, states)
-        assert (
-            df[
-                (df["mc_value_type"] == "prevalence")
-                & (df["mc_infection_stage"] == "R")
-                & (df["mc_vaccination_stage"] == "first_dose")
-            ].max()["10001"]
-            == 0
-        )
-
-        states = seir.steps_SEIR(
-            modinf,
-            parsed_parameters,
-            transition_array,
-            proportion_array,
-            proportion_info,
-            initial_conditions,
-            seeding_data,
-            seeding_amounts,
-        )
+        initial_conditions,
+        seeding_data,
+        seeding_amounts,
+    )
+    for states in replicates:
         df = seir.states2Df(modinf, states)
         assert (
             df[
@@ -3,7 +3,6 @@ import pandas as pd
 import scipy.sparse
 import logging
 import os
-import tempfile
 
 import pytest
 
@@ -13,10 +12,9 @@ from gempyor.utils import config
 TEST_SETUP_NAME = "minimal_test"
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
-os.chdir(os.path.dirname(__file__))
 
 
-def test_subpopulation_structure_mobility():
+def test_subpopulation_structure_mobility(tmp_path):
     mobility_file = f"{DATA_DIR}/mobility.csv"
 
     subpop_config_str = f"""
@@ -25,10 +23,9 @@ def test_subpopulation_structure_mobility():
             mobility: {DATA_DIR}/mobility.csv
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     subpop_struct = subpopulation_structure.SubpopulationStructure(
         setup_name=TEST_SETUP_NAME,
@@ -48,7 +45,7 @@ def test_subpopulation_structure_mobility():
     assert np.array_equal(subpop_struct.mobility.toarray(), mobility_data.to_numpy())
 
 
-def test_subpopulation_structure_mobility_txt():
+def test_subpopulation_structure_mobility_txt(tmp_path):
     config.clear()
     config.read(user=False)
     mobility_file = f"{DATA_DIR}/mobility.txt"
@@ -59,10 +56,9 @@ def test_subpopulation_structure_mobility_txt():
             mobility: {DATA_DIR}/mobility.csv
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     subpop_struct = subpopulation_structure.SubpopulationStructure(
         setup_name=TEST_SETUP_NAME, subpop_config=config["subpop_setup"]
@@ -80,7 +76,7 @@ def test_subpopulation_structure_mobility_txt():
     assert np.array_equal(subpop_struct.mobility.toarray(), mobility_data.toarray())
 
 
-def test_subpopulation_structure_subpop_population_zero_fail():
+def test_subpopulation_structure_subpop_population_zero_fail(tmp_path):
     config.clear()
     config.read(user=False)
     subpop_config_str = f"""
@@ -89,10 +85,9 @@ def test_subpopulation_structure_subpop_population_zero_fail():
             mobility: {DATA_DIR}/mobility.csv
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     with pytest.raises(ValueError, match=r".*subpops with population zero.*"):
         subpop_struct = subpopulation_structure.SubpopulationStructure(
@@ -101,7 +96,7 @@ def test_subpopulation_structure_subpop_population_zero_fail():
         )
 
 
-def test_subpopulation_structure_dulpicate_subpop_names_fail():
+def test_subpopulation_structure_dulpicate_subpop_names_fail(tmp_path):
     config.clear()
     config.read(user=False)
     subpop_config_str = f"""
@@ -110,10 +105,9 @@ def test_subpopulation_structure_dulpicate_subpop_names_fail():
             mobility: {DATA_DIR}/mobility.csv
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     with pytest.raises(ValueError, match=r"There are duplicate subpop_names.*"):
         subpop_struct = subpopulation_structure.SubpopulationStructure(
@@ -121,7 +115,7 @@ def test_subpopulation_structure_dulpicate_subpop_names_fail():
         )
 
 
-def test_subpopulation_structure_mobility_shape_fail():
+def test_subpopulation_structure_mobility_shape_fail(tmp_path):
     config.clear()
     config.read(user=False)
     subpop_config_str = f"""
@@ -130,10 +124,9 @@ def test_subpopulation_structure_mobility_shape_fail():
             mobility: {DATA_DIR}/mobility_2x3.txt
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     with pytest.raises(ValueError, match=r"mobility data must have dimensions of length of geodata.*"):
         subpop_struct = subpopulation_structure.SubpopulationStructure(
@@ -141,7 +134,7 @@ def test_subpopulation_structure_mobility_shape_fail():
         )
 
 
-def test_subpopulation_structure_mobility_fluxes_same_ori_and_dest_fail():
+def test_subpopulation_structure_mobility_fluxes_same_ori_and_dest_fail(tmp_path):
     config.clear()
     config.read(user=False)
     subpop_config_str = f"""
@@ -150,10 +143,9 @@ def test_subpopulation_structure_mobility_fluxes_same_ori_and_dest_fail():
             mobility: {DATA_DIR}/mobility_same_ori_dest.csv
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     with pytest.raises(ValueError, match=r"Mobility fluxes with same origin and destination.*"):
         subpop_struct = subpopulation_structure.SubpopulationStructure(
@@ -161,7 +153,7 @@ def test_subpopulation_structure_mobility_fluxes_same_ori_and_dest_fail():
         )
 
 
-def test_subpopulation_structure_mobility_npz_shape_fail():
+def test_subpopulation_structure_mobility_npz_shape_fail(tmp_path):
     config.clear()
     config.read(user=False)
     subpop_config_str = f"""
@@ -170,10 +162,9 @@ def test_subpopulation_structure_mobility_npz_shape_fail():
             mobility: {DATA_DIR}/mobility_2x3.npz
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     with pytest.raises(ValueError, match=r"mobility data must have dimensions of length of geodata.*"):
         subpop_struct = subpopulation_structure.SubpopulationStructure(
@@ -181,7 +172,7 @@ def test_subpopulation_structure_mobility_npz_shape_fail():
         )
 
 
-def test_subpopulation_structure_mobility_no_extension_fail():
+def test_subpopulation_structure_mobility_no_extension_fail(tmp_path):
     config.clear()
     config.read(user=False)
     subpop_config_str = f"""
@@ -190,10 +181,9 @@ def test_subpopulation_structure_mobility_no_extension_fail():
             mobility: {DATA_DIR}/mobility
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     with pytest.raises(ValueError, match=r"Mobility data must either be a.*"):
         subpop_struct = subpopulation_structure.SubpopulationStructure(
@@ -201,7 +191,7 @@ def test_subpopulation_structure_mobility_no_extension_fail():
         )
 
 
-def test_subpopulation_structure_mobility_exceed_source_node_pop_fail():
+def test_subpopulation_structure_mobility_exceed_source_node_pop_fail(tmp_path):
     config.clear()
     config.read(user=False)
     subpop_config_str = f"""
@@ -210,10 +200,9 @@ def test_subpopulation_structure_mobility_exceed_source_node_pop_fail():
             mobility: {DATA_DIR}/mobility1001.csv
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     with pytest.raises(
         ValueError, match=r"The following entries in the mobility data exceed the source subpop populations.*"
@@ -223,7 +212,7 @@ def test_subpopulation_structure_mobility_exceed_source_node_pop_fail():
         )
 
 
-def test_subpopulation_structure_mobility_rows_exceed_source_node_pop_fail():
+def test_subpopulation_structure_mobility_rows_exceed_source_node_pop_fail(tmp_path):
     config.clear()
     config.read(user=False)
     subpop_config_str = f"""
@@ -232,10 +221,9 @@ def test_subpopulation_structure_mobility_rows_exceed_source_node_pop_fail():
             mobility: {DATA_DIR}/mobility_row_exceeed.txt
     """
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
     with pytest.raises(
         ValueError, match=r"The following entries in the mobility data exceed the source subpop populations.*"
@@ -245,21 +233,20 @@ def test_subpopulation_structure_mobility_rows_exceed_source_node_pop_fail():
         )
 
 
-def test_subpopulation_structure_mobility_no_mobility_matrix_specified():
+def test_subpopulation_structure_mobility_no_mobility_matrix_specified(tmp_path):
     subpop_config_str = f"""
         subpop_setup:
             geodata: {DATA_DIR}/geodata.csv
     """
     config.clear()
     config.read(user=False)
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:  # Creates a temporary file
-        temp_file.write(subpop_config_str.encode("utf-8"))  # Write the content
-        temp_file.close()  # Ensure the file is closed
-        config.set_file(temp_file.name)  # Load from the temporary file path
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(subpop_config_str)
+    config.set_file(str(config_file))
 
-        subpop_struct = subpopulation_structure.SubpopulationStructure(
-            setup_name=TEST_SETUP_NAME, subpop_config=config["subpop_setup"]
-        )
+    subpop_struct = subpopulation_structure.SubpopulationStructure(
+        setup_name=TEST_SETUP_NAME, subpop_config=config["subpop_setup"]
+    )
 
     # target = np.array([[0, 0], [0, 0]]) # 2x2, just in this case
     assert np.array_equal(subpop_struct.mobility.toarray(), np.zeros((2, 2)))
@@ -1,6 +1,7 @@
 import pytest
 import datetime
 import os
+import pathlib
 from mock import MagicMock
 
 from typing import Callable, Any
@@ -143,3 +144,27 @@ def test_create_file_name_without_extension(
             create_directory,
         )
     )
+
+
+@pytest.mark.parametrize(
+    ("run_id", "prefix", "inference_filepath_suffix", "inference_filename_prefix"),
+    [
+        ("run", "", "", ""),
+        ("run", "USA/inference/", "000000001", "global/intermediate/"),
+        ("run{1}", "{prefix}/", "", ""),  # braces are kept as they are
+    ],
+)
+def test_create_file_name_template(run_id, prefix, inference_filepath_suffix, inference_filename_prefix):
+    template = file_paths.create_file_name_template(
+        run_id, prefix, inference_filepath_suffix, inference_filename_prefix
+    )
+    for ftype, index in [("seir", 1), ("hosp", 123)]:
+        assert template.format(ftype=ftype, index=index) == str(
+            pathlib.Path(
+                "model_output",
+                prefix,
+                ftype,
+                inference_filepath_suffix,
+                f"{inference_filename_prefix}{index:>09}.{run_id}.{ftype}",
+            )
+        )
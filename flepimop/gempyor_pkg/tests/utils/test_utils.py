@@ -2,12 +2,18 @@ import pytest
 import os
 import pandas as pd
 import pyarrow as pa
+import inspect
+import subprocess
+import sys
 import time
 from gempyor import utils
 
 DATA_DIR = os.path.dirname(__file__) + "/data"
 tmp_path = "/tmp"
 
+# the tests share /tmp/data
+pytestmark = pytest.mark.xdist_group(name="utils")
+
 
 @pytest.mark.parametrize(
     ("fname", "extension"), [("mobility", "csv"), ("usa-geoid-params-output", "parquet"),],
@@ -46,6 +52,15 @@ def test_read_df_and_write_fail(fname, extension):
             utils.write_df(tmp_path + "/data/" + fname, df2, extension="")
 
 
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_write_df_from_dict_success(extension):
+    os.makedirs(tmp_path + "/data", exist_ok=True)
+    columns = {"date": ["2020-01-01", "2020-01-02"], "value": [1.5, 2.5]}
+    utils.write_df(tmp_path + "/data/from_dict", columns, extension=extension)
+    df = utils.read_df(tmp_path + "/data/from_dict", extension=extension)
+    assert df.equals(pd.DataFrame(columns))
+
+
 @pytest.mark.parametrize(("fname", "extension"), [("mobility", "")])
 def test_read_df_fail(fname, extension):
     with pytest.raises(NotImplementedError, match=r".*Invalid.*extension.*"):
@@ -151,3 +166,45 @@ def test_create_resume_file_names_map():
     )
     for k in name_map:
         assert k.find("s3://bucket") >= 0
+
+
+def test_import_gempyor_is_lazy():
+    # in a fresh interpreter, as the other tests have already imported everything
+    code = (
+        "import sys, gempyor; "
+        "loaded = [m for m in ('gempyor.inference', 'gempyor.seir', 'gempyor.outcomes', 'numba') if m in sys.modules]; "
+        "assert not loaded, loaded; "
+        "assert 'GempyorInference' in gempyor.__all__ and 'config' in gempyor.__all__; "
+        "ns = {}; exec('from gempyor import *', ns); "
+        "assert 'GempyorInference' in ns and 'seir' in ns and 'config' in ns"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_gempyor_lazy_names_cover_inference():
+    import gempyor
+    from gempyor import inference
+
+    # the functions and classes inference defines, and the gempyor submodules it imports
+    api = {
+        name
+        for name, value in vars(inference).items()
+        if not name.startswith("_")
+        and (
+            getattr(value, "__module__", None) == inference.__name__
+            or (inspect.ismodule(value) and value.__name__.startswith("gempyor."))
+        )
+    }
+    assert api <= set(gempyor._LAZY_NAMES)
+    for name in gempyor._LAZY_NAMES:
+        assert getattr(gempyor, name) is getattr(inference, name)
+
+
+def test_gempyor_missing_attribute_does_not_load_inference():
+    code = (
+        "import sys, gempyor; "
+        "assert not hasattr(gempyor, 'no_such_name'); "
+        "assert 'gempyor.inference' not in sys.modules; "
+        "assert gempyor.seeding.__name__ == 'gempyor.seeding'"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)